@@ -0,0 +1,108 @@
+"""Endpointlar uchun parallel so'rovlar cheklovi va navbat."""
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Navbat to'lgan yoki kutish vaqti tugagan — so'rov qabul qilinmadi."""
+
+    def __init__(self, name: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"'{name}' band: {reason}. {retry_after} soniyadan keyin qayta urinib ko'ring")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bir vaqtda bajariladigan so'rovlar sonini cheklaydi.
+
+    Cheklovdan ortiq so'rovlar cheklangan navbatda kutadi. Navbat to'lsa
+    yoki kutish `queue_timeout` dan oshsa, AdmissionRejected ko'tariladi
+    (server uni 429 + Retry-After ga aylantiradi). Shunday qilib, ortiqcha
+    yuklamada har bir so'rov o'z brauzer kontekstini ochib, xotirani
+    tugatmaydi.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float) -> None:
+        self._name = name
+        self._limit = max(limit, 1)
+        self._queue_size = max(queue_size, 0)
+        self._queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(self._limit)
+        self._in_flight = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        # Xizmat vaqtining eksponensial o'rtachasi (Retry-After hisoblash uchun)
+        self._service_time = 0.0
+
+    def _retry_after(self) -> int:
+        """Navbatdagi so'rovlar tugashigacha taxminiy vaqt (soniyalarda)."""
+        per_slot = self._service_time or 5.0
+        return max(1, math.ceil(per_slot * (self._waiting + 1) / self._limit))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self._rejected += 1
+        retry_after = self._retry_after()
+        logger.warning(
+            f"[{self._name}] so'rov rad etildi: {reason} "
+            f"(bajarilmoqda={self._in_flight}, navbatda={self._waiting}, retry_after={retry_after})"
+        )
+        return AdmissionRejected(self._name, reason, retry_after)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None, None]:
+        """So'rov uchun joy olish; kerak bo'lsa navbatda kutish."""
+        started = time.perf_counter()
+        if not self._semaphore.locked():
+            # Bo'sh joy bor — kutmasdan (va event loop ga qaytmasdan) olinadi
+            await self._semaphore.acquire()
+        else:
+            if self._waiting >= self._queue_size:
+                raise self._reject("navbat to'lgan")
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self._queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject("navbatda kutish vaqti tugadi") from None
+            finally:
+                self._waiting -= 1
+
+        wait = time.perf_counter() - started
+        self._admitted += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        if wait > 0.1:
+            logger.info(f"[{self._name}] so'rov navbatda {wait:.2f} s kutdi")
+
+        self._in_flight += 1
+        service_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+            service = time.perf_counter() - service_started
+            self._service_time = service if not self._service_time else 0.8 * self._service_time + 0.2 * service
+
+    def stats(self) -> dict:
+        """Navbat holati /health uchun."""
+        return {
+            "limit": self._limit,
+            "in_flight": self._in_flight,
+            "queued": self._waiting,
+            "queue_size": self._queue_size,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._total_wait / self._admitted * 1000, 1) if self._admitted else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 1),
+            "avg_service_ms": round(self._service_time * 1000, 1),
+        }
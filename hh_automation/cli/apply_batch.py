@@ -0,0 +1,227 @@
+"""JSONL fayldagi vakansiyalarga HTTP serversiz, to'g'ridan-to'g'ri ommaviy javob berish."""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Optional, TextIO
+
+from ..config import get_settings
+from ..services.apply import ApplyStatus, VacancyApplyService
+from ..services.browser import browser_manager
+from ..services.replay import REPLAY
+from ..services.session import SessionExpiredError, session_checker
+
+logger = logging.getLogger(__name__)
+
+
+def read_done(output: Path, retry_errors: bool) -> set[str]:
+    """
+    Oldingi ishga tushirishda qayta ishlangan URL larni o'qish (davom ettirish uchun).
+
+    Argumentlar:
+        output: Natijalar JSONL fayli.
+        retry_errors: Xato bilan tugaganlarini qayta ishlash uchun o'tkazib yubormaslik.
+
+    Qaytaradi:
+        Qayta ishlanmaydigan URL lar to'plami.
+    """
+    if not output.exists():
+        return set()
+    # URL bo'yicha oxirgi holat (qayta urinishlar faylga keyinroq yoziladi)
+    statuses: dict[str, Optional[str]] = {}
+    with output.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Uzilgan ishga tushirishdan qolgan chala qator
+                continue
+            if isinstance(record, dict) and record.get("url"):
+                statuses[record["url"]] = record.get("status")
+    return {
+        url for url, status in statuses.items()
+        if not (retry_errors and status == ApplyStatus.ERROR.value)
+    }
+
+
+def iter_jobs(input_path: Path, done: set[str]) -> Iterator[tuple[int, str, str]]:
+    """Kirish faylidan (qator raqami, url, xat) yozuvlarini oqim bilan o'qish."""
+    seen: set[str] = set()
+    with input_path.open(encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                url = record["url"]
+                message = record.get("message") or ""
+            except (ValueError, KeyError, TypeError, AttributeError):
+                logger.warning(f"{input_path}:{line_no}: noto'g'ri yozuv o'tkazib yuborildi")
+                continue
+            if not isinstance(url, str) or not url or not isinstance(message, str):
+                logger.warning(f"{input_path}:{line_no}: url va message satr bo'lishi kerak, yozuv o'tkazib yuborildi")
+                continue
+            if url in done or url in seen:
+                continue
+            seen.add(url)
+            yield line_no, url, message
+
+
+def _ends_with_newline(path: Path) -> bool:
+    if not path.exists() or path.stat().st_size == 0:
+        return True
+    with path.open("rb") as f:
+        f.seek(-1, 2)
+        return f.read(1) == b"\n"
+
+
+class BatchWriter:
+    """Natijalarni har bir qatordan keyin diskka yozadigan JSONL yozuvchi."""
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self.counts: dict[str, int] = {}
+
+    def write(self, record: dict) -> None:
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        self.counts[record["status"]] = self.counts.get(record["status"], 0) + 1
+
+
+async def _apply_one(
+    service: VacancyApplyService,
+    writer: BatchWriter,
+    semaphore: asyncio.Semaphore,
+    line_no: int,
+    url: str,
+    message: str,
+    refuse_duplicates: bool,
+) -> None:
+    started = time.perf_counter()
+    try:
+        result = await service.apply(url, message, refuse_duplicates=refuse_duplicates)
+    except Exception as e:
+        # Natija faylida va yakuniy hisobda har bir vakansiya aks etishi kerak
+        logger.error(f"Javob berish kutilmagan xato bilan tugadi {url}: {e}", exc_info=True)
+        result = {"status": ApplyStatus.ERROR.value, "message": str(e)}
+    finally:
+        semaphore.release()
+    record = {
+        "line": line_no,
+        "url": url,
+        **result,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    writer.write(record)
+    print(f"[{record['status'].upper()}] {url}: {record.get('message', '')}")
+
+
+async def run_batch(
+    input_path: Path,
+    output_path: Path,
+    concurrency: int,
+    refuse_duplicates: bool,
+    retry_errors: bool,
+) -> dict[str, int]:
+    """
+    Kirish faylidagi vakansiyalarga cheklangan parallellik bilan javob berish.
+
+    Kirish fayli oqim bilan o'qiladi: bir vaqtda `concurrency` tadan ortiq
+    vazifa yaratilmaydi. Har bir natija tayyor bo'lishi bilan chiqish fayliga
+    yoziladi, shuning uchun uzilgan ishga tushirish shu fayldan davom etadi.
+
+    Qaytaradi:
+        Holatlar bo'yicha natijalar soni.
+    """
+    done = read_done(output_path, retry_errors)
+    if done:
+        print(f"Davom ettirilmoqda: {len(done)} ta vakansiya allaqachon qayta ishlangan")
+
+    service = VacancyApplyService()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    tasks: set[asyncio.Task] = set()
+    failures: list[BaseException] = []
+
+    def on_done(task: asyncio.Task) -> None:
+        # Tugagan vazifa to'plamdan chiqadi, shuning uchun xatosi shu yerda olinadi
+        tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            failures.append(task.exception())
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    await browser_manager.start()
+    try:
+        with output_path.open("a", encoding="utf-8") as f:
+            # Uzilgan oxirgi qatorga yangi natija yopishib qolmasligi uchun
+            if not _ends_with_newline(output_path):
+                f.write("\n")
+            writer = BatchWriter(f)
+            for line_no, url, message in iter_jobs(input_path, done):
+                await semaphore.acquire()
+                task = asyncio.create_task(
+                    _apply_one(service, writer, semaphore, line_no, url, message, refuse_duplicates)
+                )
+                tasks.add(task)
+                task.add_done_callback(on_done)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            if failures:
+                # Masalan, natija fayliga yozib bo'lmadi — davom etish natijalarni yo'qotadi
+                raise failures[0]
+    finally:
+        await browser_manager.stop()
+    return writer.counts
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", help='Kirish JSONL fayli: har bir qatorda {"url": ..., "message": ...}')
+    parser.add_argument("output", help="Natijalar JSONL fayli (mavjud bo'lsa, shu joydan davom etiladi)")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.apply_concurrency,
+        help="Bir vaqtda javob beriladigan vakansiyalar soni (standart: APPLY_CONCURRENCY)"
+    )
+    parser.add_argument(
+        "--refuse-duplicates", action="store_true", default=settings.apply_refuse_duplicates,
+        help="Dublikat deb belgilangan vakansiyalarni o'tkazib yuborish"
+    )
+    parser.add_argument(
+        "--retry-errors", action="store_true",
+        help="Oldingi ishga tushirishda xato bilan tugaganlarini qayta urinish"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"Kirish fayli topilmadi: {input_path}")
+        sys.exit(1)
+
+    # Sessiya yaroqsiz bo'lsa, har bir vakansiya xato bilan yozilmasligi uchun oldindan tekshiriladi
+    if browser_manager.mode != REPLAY:
+        try:
+            session_checker.validate()
+        except (FileNotFoundError, SessionExpiredError) as e:
+            print(f"Sessiya yaroqsiz: {e}")
+            sys.exit(1)
+
+    started = time.perf_counter()
+    counts = asyncio.run(run_batch(
+        input_path, Path(args.output), args.concurrency, args.refuse_duplicates, args.retry_errors
+    ))
+    summary = ", ".join(f"{status}={count}" for status, count in sorted(counts.items())) or "yangi vakansiyalar yo'q"
+    print(f"\nTayyor ({time.perf_counter() - started:.1f} s): {summary}")
+
+
+if __name__ == "__main__":
+    main()
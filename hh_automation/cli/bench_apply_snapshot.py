@@ -0,0 +1,205 @@
+"""Javob berish uchun IPC chaqiruvlari: joriy kod va snapshot dan oldingi kod (replay fiksturalarida)."""
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+import types
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+from ..config import get_settings
+from ..services.apply import VacancyApplyService
+from ..services.browser import browser_manager
+from ..services.replay import fixture_store
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_FIXTURE_ARG_RE = re.compile(r"get_page\([^)]*\bfixture=", re.DOTALL)
+
+# Qattiq kutishlar (wait_for_timeout) qaror qabul qilish vaqtiga kirmaydi
+_SLEEP_METHODS = {"waitForTimeout"}
+
+
+class CallCounter:
+    """Bitta javob berish davomida Playwright drayveriga yuborilgan chaqiruvlar."""
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self.ipc_ms = 0.0
+
+    def add(self, method: str, ms: float) -> None:
+        self.calls[method] += 1
+        if method not in _SLEEP_METHODS:
+            self.ipc_ms += ms
+
+
+_active_counter: ContextVar[Optional[CallCounter]] = ContextVar("active_counter", default=None)
+
+
+def install_call_counter() -> None:
+    """
+    Playwright kanaliga hisoblagich o'rnatish.
+
+    Ichki API (Channel._inner_send) ishlatiladi: javob kutiladigan har bir
+    drayver chaqiruvi shu yerdan o'tadi. Faqat o'lchanayotgan javob berish
+    vazifasidagi chaqiruvlar hisoblanadi (replay routing hisobga kirmaydi).
+    """
+    from playwright._impl._connection import Channel
+
+    original = Channel._inner_send
+    if getattr(original, "_bench_counted", False):
+        return
+
+    async def counted(self, method, *args, **kwargs):
+        counter = _active_counter.get()
+        if counter is None:
+            return await original(self, method, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await original(self, method, *args, **kwargs)
+        finally:
+            counter.add(method, (time.perf_counter() - started) * 1000)
+
+    counted._bench_counted = True
+    Channel._inner_send = counted
+
+
+def load_baseline_service(ref: str) -> type:
+    """
+    `ref` commitidagi services/apply.py ni joriy paket ichida yuklash.
+
+    Qolgan modullar (brauzer, replay, sessiya) joriy koddan olinadi, shuning
+    uchun ikkala yondashuv bir xil sharoitda o'lchanadi. Faqat get_page() ga
+    fixture= uzatadigan (record/replay qo'shilgandan keyingi) commitlar qabul qilinadi.
+    """
+    source = subprocess.run(
+        ["git", "show", f"{ref}:hh_automation/services/apply.py"],
+        cwd=_REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    # fixture= siz get_page() chaqiradigan eski kod replay dan tashqariga chiqishga urinadi —
+    # bunday commit bilan haqiqiy javoblar yuborilmasligi uchun rad etiladi
+    if not _FIXTURE_ARG_RE.search(source):
+        raise SystemExit(
+            f"{ref}: services/apply.py get_page() ga fixture= bermaydi, replay da xavfsiz o'lchab bo'lmaydi"
+        )
+    module = types.ModuleType("hh_automation.services._apply_baseline")
+    module.__package__ = "hh_automation.services"
+    module.__file__ = f"{ref}:hh_automation/services/apply.py"
+    sys.modules[module.__name__] = module
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module.VacancyApplyService
+
+
+async def _measure(service, meta: dict) -> dict:
+    counter = CallCounter()
+    token = _active_counter.set(counter)
+    started = time.perf_counter()
+    try:
+        result = await service.apply(meta["url"], meta.get("message", ""))
+    finally:
+        _active_counter.reset(token)
+    return {
+        "status": result.get("status"),
+        "calls": sum(counter.calls.values()),
+        "by_method": dict(counter.calls),
+        "ipc_ms": counter.ipc_ms,
+        "total_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def _summary(runs: list[dict]) -> dict:
+    return {
+        "status": runs[-1]["status"],
+        "calls": statistics.median(run["calls"] for run in runs),
+        "ipc_ms": round(statistics.median(run["ipc_ms"] for run in runs), 2),
+        "total_ms": round(statistics.median(run["total_ms"] for run in runs), 2),
+        "by_method": runs[-1]["by_method"],
+    }
+
+
+async def bench(names: list[str], runs: int, baseline_ref: Optional[str]) -> dict:
+    """
+    Har bir apply fiksturasida haqiqiy javob berishni replay rejimida bajarish.
+
+    Qaytaradi:
+        Fikstura nomi bo'yicha joriy (va berilgan bo'lsa, baseline) kod uchun
+        chaqiruvlar soni, drayver chaqiruvlari vaqti va jami vaqt medianasi.
+    """
+    services = {"current": VacancyApplyService()}
+    if baseline_ref:
+        services["baseline"] = load_baseline_service(baseline_ref)()
+
+    install_call_counter()
+    report: dict = {}
+    await browser_manager.start()
+    try:
+        for name in names:
+            meta = fixture_store.read_json(name, "meta.json")
+            measured: dict[str, list[dict]] = {label: [] for label in services}
+            for _ in range(runs):
+                # Navbatma-navbat: brauzer "qizishi" bir tomonga foyda bermasin
+                for label, service in services.items():
+                    measured[label].append(await _measure(service, meta))
+            report[name] = {label: _summary(values) for label, values in measured.items()}
+            print(json.dumps({name: report[name]}, ensure_ascii=False))
+    finally:
+        await browser_manager.stop()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("fixtures", nargs="*", help="apply fikstura nomlari (standart: hammasi)")
+    parser.add_argument("--runs", type=int, default=5, help="Har bir fikstura uchun ijrolar soni")
+    parser.add_argument(
+        "--baseline-ref", default=None,
+        help="Solishtirish uchun services/apply.py olinadigan git commit (masalan, snapshot dan oldingi)"
+    )
+    parser.add_argument("--output", default=None, help="Natijalarni JSON faylga yozish")
+    args = parser.parse_args()
+
+    # Javoblar faqat yozuvdan ijro etiladi — bosishlar xavfsiz; mahalliy omborlarga yozilmaydi
+    settings = get_settings()
+    settings.browser_mode = "replay"
+    settings.vacancy_index_enabled = False
+    settings.dedup_enabled = False
+    settings.apply_learn_strategy_order = False
+
+    names = [
+        name for name in (args.fixtures or fixture_store.names())
+        if (fixture_store.read_json(name, "meta.json") or {}).get("kind") == "apply"
+    ]
+    if not names:
+        print(f"apply fiksturalari topilmadi: {fixture_store.root}")
+        print("Avval BROWSER_MODE=record bilan /apply ni ishga tushiring.")
+        return
+
+    report = asyncio.run(bench(names, args.runs, args.baseline_ref))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print()
+    for name, result in report.items():
+        current = result["current"]
+        line = f"{name}: {current['calls']} chaqiruv, {current['ipc_ms']} ms"
+        baseline = result.get("baseline")
+        if baseline:
+            line = (
+                f"{name}: {baseline['calls']} -> {current['calls']} chaqiruv, "
+                f"{baseline['ipc_ms']} -> {current['ipc_ms']} ms"
+            )
+            if baseline["status"] != current["status"]:
+                line += f"  [NATIJA FARQLI: {baseline['status']} != {current['status']}]"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Server ishga tushish vaqtini o'lchash: time-to-listen va time-to-first-search."""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from typing import Optional
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_json(url: str, timeout: float) -> Optional[dict]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return json.loads(response.read())
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return None
+
+
+def _wait_for(predicate, deadline: float, interval: float = 0.05):
+    while time.perf_counter() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(interval)
+    return None
+
+
+def bench(query: Optional[str], timeout: float) -> dict:
+    """
+    Serverni alohida jarayonda ishga tushirib, bosqichlar vaqtini o'lchash.
+
+    Qaytaradi:
+        time_to_listen, time_to_browser_ready, time_to_first_search (soniyalarda)
+        va serverning o'zi /health da bergan startup ko'rsatkichlari.
+    """
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "SERVER_HOST": "127.0.0.1", "SERVER_PORT": str(port)}
+
+    started = time.perf_counter()
+    deadline = started + timeout
+    process = subprocess.Popen(
+        [sys.executable, "-m", "hh_automation.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    result: dict = {"timestamp": datetime.now().isoformat(timespec="seconds")}
+
+    try:
+        health = _wait_for(lambda: _get_json(f"{base_url}/health", 1.0), deadline)
+        if health is None:
+            result["error"] = "Server belgilangan vaqtda javob bermadi"
+            return result
+        result["time_to_listen"] = round(time.perf_counter() - started, 3)
+
+        health = _wait_for(
+            lambda: (h := _get_json(f"{base_url}/health", 1.0)) and h["status"] != "starting" and h,
+            deadline
+        )
+        if health:
+            result["browser_status"] = health["status"]
+            result["time_to_browser_ready"] = round(time.perf_counter() - started, 3)
+
+        if query is not None:
+            params = urllib.parse.urlencode({"text": query, "fields": "id"})
+            remaining = max(deadline - time.perf_counter(), 1.0)
+            if _get_json(f"{base_url}/search?{params}", remaining) is not None:
+                result["time_to_first_search"] = round(time.perf_counter() - started, 3)
+            else:
+                result["search_error"] = "Qidiruv muvaffaqsiz bo'ldi"
+
+        health = _get_json(f"{base_url}/health", 1.0)
+        if health:
+            result["server_startup"] = health.get("startup", {})
+        return result
+
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3, help="O'lchashlar soni")
+    parser.add_argument("--query", default=None, help="Birinchi /search uchun so'rov (berilmasa qidiruv o'lchanmaydi)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Bitta o'lchash uchun maksimal vaqt (s)")
+    parser.add_argument("--output", default=None, help="Natijalarni JSONL fayliga qo'shish (commitlar orasida solishtirish uchun)")
+    args = parser.parse_args()
+
+    for run in range(args.runs):
+        result = bench(args.query, args.timeout)
+        result["run"] = run + 1
+        line = json.dumps(result, ensure_ascii=False)
+        print(line)
+        if args.output:
+            with open(args.output, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Yozib olingan fiksturalar ustida oflayn benchmark: tahlil to'g'riligi va bosqichlar vaqti."""
+import argparse
+import asyncio
+import json
+import statistics
+from typing import Any, Optional
+
+from ..config import get_settings
+from ..services.browser import browser_manager
+from ..services.replay import fixture_store
+from ..services.search import VACANCY_FIELDS, VacancySearchService
+from ..services.apply import VacancyApplyService
+
+# duplicate_of yozib olish paytidagi ombor holatiga bog'liq, shuning uchun solishtirilmaydi
+_COMPARED_FIELDS = tuple(field for field in VACANCY_FIELDS if field != "duplicate_of")
+
+
+def _matches(kind: str, expected: Any, actual: Any) -> Optional[bool]:
+    """Qayta ijro natijasini yozib olingan natija bilan solishtirish."""
+    if expected is None:
+        return None
+    if kind == "search":
+        def strip(items):
+            return [{k: item.get(k) for k in _COMPARED_FIELDS} for item in items]
+        return strip(expected) == strip(actual)
+    return expected.get("status") == actual.get("status")
+
+
+async def _run_fixture(name: str, meta: dict) -> Any:
+    if meta["kind"] == "search":
+        return await VacancySearchService().search(query=meta["query"], page_num=meta["page"])
+    return await VacancyApplyService().apply(meta["url"], meta.get("message", ""))
+
+
+async def bench(names: list[str], runs: int) -> dict:
+    """
+    Har bir fiksturani replay rejimida bir necha marta ijro etish.
+
+    Qaytaradi:
+        Fikstura nomi bo'yicha: natija mosligi, bosqichlar va jami vaqt medianasi (ms).
+    """
+    report: dict = {}
+    await browser_manager.start()
+    try:
+        for name in names:
+            meta = fixture_store.read_json(name, "meta.json")
+            if not meta:
+                print(f"[O'TKAZIB YUBORILDI] {name}: meta.json topilmadi")
+                continue
+
+            expected = fixture_store.read_json(name, "result.json")
+            totals: list[float] = []
+            stages: dict[str, list[float]] = {}
+            match: Optional[bool] = None
+            error: Optional[str] = None
+
+            for _ in range(runs):
+                # Muvaffaqiyatsiz ijroda oldingi ishga tushirishning vaqtlari o'qilmasin
+                fixture_store.remove(name, "timings-replay.json")
+                try:
+                    actual = await _run_fixture(name, meta)
+                except Exception as e:
+                    # Masalan, selektor o'zgargani uchun wait_for_selector timeout —
+                    # aynan shu regressiyalar qidiriladi, qolgan fiksturalar davom etadi
+                    match, error = False, f"{type(e).__name__}: {e}"
+                    continue
+                run_match = _matches(meta["kind"], expected, actual)
+                match = run_match if match is None else match and run_match
+
+                timings = fixture_store.read_json(name, "timings-replay.json")
+                if not timings:
+                    continue
+                totals.append(timings.get("total_ms", 0.0))
+                for stage in timings.get("stages", []):
+                    stages.setdefault(stage["stage"], []).append(stage["ms"])
+
+            report[name] = {
+                "kind": meta["kind"],
+                "match": match,
+                "error": error,
+                "total_ms": round(statistics.median(totals), 2) if totals else None,
+                "stages_ms": {stage: round(statistics.median(values), 2) for stage, values in stages.items()},
+            }
+            suffix = f" error={error}" if error else ""
+            print(f"{name}: match={match} total={report[name]['total_ms']} ms{suffix}")
+    finally:
+        await browser_manager.stop()
+    return report
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Joriy natijalarni oldingi commit natijalari bilan solishtirib chiqarish."""
+    print("\nBaseline bilan solishtirish:")
+    for name, current in report.items():
+        previous = baseline.get(name)
+        if not previous:
+            print(f"  {name}: baseline da yo'q")
+            continue
+        before, after = previous["total_ms"], current["total_ms"]
+        flag = "" if current["match"] is not False else "  [NATIJA O'ZGARDI]"
+        if before is None or after is None:
+            print(f"  {name}: {before} -> {after} ms{flag}")
+            continue
+        delta = (after - before) / before * 100 if before else 0.0
+        print(f"  {name}: {before} -> {after} ms ({delta:+.1f}%){flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("fixtures", nargs="*", help="Fikstura nomlari (standart: hammasi)")
+    parser.add_argument("--runs", type=int, default=3, help="Har bir fikstura uchun ijrolar soni")
+    parser.add_argument("--latency-ms", type=int, default=None, help="Har bir javobga qo'shiladigan kechikish")
+    parser.add_argument("--output", default=None, help="Natijalarni JSON faylga yozish")
+    parser.add_argument("--baseline", default=None, help="Solishtirish uchun oldingi --output fayli")
+    args = parser.parse_args()
+
+    # Ijro oflayn va deterministik bo'lishi uchun mahalliy omborlarga yozilmaydi
+    settings = get_settings()
+    settings.browser_mode = "replay"
+    settings.vacancy_index_enabled = False
+    settings.dedup_enabled = False
+    settings.apply_learn_strategy_order = False
+    if args.latency_ms is not None:
+        settings.replay_latency_ms = args.latency_ms
+
+    names = args.fixtures or fixture_store.names()
+    if not names:
+        print(f"Fiksturalar topilmadi: {fixture_store.root}")
+        print("Avval BROWSER_MODE=record bilan /search yoki /apply ni ishga tushiring.")
+        return
+
+    report = asyncio.run(bench(names, args.runs))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
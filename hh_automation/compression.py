@@ -0,0 +1,111 @@
+"""JSON javoblarini seriyalash va siqish."""
+
+import gzip
+import json
+import logging
+import time
+from typing import Any, Optional
+
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:  # brotli ixtiyoriy bog'liqlik
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    """Accept-Encoding sarlavhasini {kodlash: q} lug'atiga aylantirish."""
+    encodings: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        # Parametr nomlari registrga bog'liq emas (RFC 9110): "Q=0" ham rad etish
+        param = params.strip().lower()
+        if param.startswith("q="):
+            try:
+                q = float(param[2:])
+            except ValueError:
+                # Tahlil qilib bo'lmaydigan q yo'q deb hisoblanadi
+                pass
+        encodings[name] = q
+    return encodings
+
+
+def _is_accepted(encodings: dict[str, float], name: str) -> bool:
+    """Aniq ko'rsatilgan q qiymati `*` dan ustun (masalan, "gzip;q=0, *" — gzip rad etilgan)."""
+    if name in encodings:
+        return encodings[name] > 0
+    return encodings.get("*", 0) > 0
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Mijoz qabul qiladigan eng yaxshi siqish usulini tanlash (br > gzip)."""
+    encodings = _parse_accept_encoding(accept_encoding or "")
+    if brotli is not None and "br" in encodings and encodings["br"] > 0:
+        return "br"
+    if _is_accepted(encodings, "gzip"):
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Baytlarni tanlangan usul bilan siqish."""
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=min(level, 9))
+
+
+def json_response(
+    content: Any,
+    accept_encoding: str = "",
+    min_size: int = 1024,
+    level: int = 6
+) -> Response:
+    """
+    Ma'lumotni JSON ga seriyalash va kerak bo'lsa siqib qaytarish.
+
+    Javob sarlavhalarida foydali yuk o'lchami va seriyalash vaqti beriladi:
+    X-Uncompressed-Size, X-Payload-Size, X-Serialize-Time-Ms, X-Compress-Time-Ms.
+
+    Argumentlar:
+        content: JSON ga aylantiriladigan ma'lumot.
+        accept_encoding: Mijozning Accept-Encoding sarlavhasi.
+        min_size: Siqish boshlanadigan minimal o'lcham (baytlarda).
+        level: Siqish darajasi.
+
+    Qaytaradi:
+        Tayyor Response obyekti.
+    """
+    started = time.perf_counter()
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    serialize_ms = (time.perf_counter() - started) * 1000
+
+    raw_size = len(body)
+    headers = {
+        "Vary": "Accept-Encoding",
+        "X-Uncompressed-Size": str(raw_size),
+        "X-Serialize-Time-Ms": f"{serialize_ms:.2f}",
+    }
+
+    encoding = choose_encoding(accept_encoding) if raw_size >= min_size else None
+    compress_ms = 0.0
+    if encoding:
+        started = time.perf_counter()
+        body = compress(body, encoding, level)
+        compress_ms = (time.perf_counter() - started) * 1000
+        headers["Content-Encoding"] = encoding
+        headers["X-Compress-Time-Ms"] = f"{compress_ms:.2f}"
+
+    headers["X-Payload-Size"] = str(len(body))
+    encoding_name = encoding or "yo'q"
+    logger.info(
+        f"JSON javob: {raw_size} -> {len(body)} bayt "
+        f"(kodlash={encoding_name}, seriyalash={serialize_ms:.2f} ms, siqish={compress_ms:.2f} ms)"
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from functools import lru_cache
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -26,11 +27,71 @@ class Settings(BaseSettings):
     browser_slow_mo: int = Field(default=0, alias="BROWSER_SLOW_MO")
     page_timeout: int = Field(default=30000, alias="PAGE_TIMEOUT")
 
+    # Yozib olish / qayta ijro (oflayn benchmark va regressiya testlari uchun)
+    browser_mode: Literal["live", "record", "replay"] = Field(default="live", alias="BROWSER_MODE")
+    fixtures_dir: Optional[Path] = Field(default=None, alias="FIXTURES_DIR")
+    replay_latency_ms: int = Field(default=0, alias="REPLAY_LATENCY_MS")
+
+    # Sessiyani davriy tekshirish (0 — o'chirilgan)
+    session_probe_interval: int = Field(default=900, alias="SESSION_PROBE_INTERVAL")
+    session_probe_url: str = Field(
+        default="https://tashkent.hh.uz/applicant/resumes",
+        alias="SESSION_PROBE_URL"
+    )
+
+    # Parallel so'rovlar cheklovi va navbat
+    search_concurrency: int = Field(default=2, alias="SEARCH_CONCURRENCY")
+    search_queue_size: int = Field(default=10, alias="SEARCH_QUEUE_SIZE")
+    apply_concurrency: int = Field(default=2, alias="APPLY_CONCURRENCY")
+    apply_queue_size: int = Field(default=20, alias="APPLY_QUEUE_SIZE")
+    admission_queue_timeout: float = Field(default=120.0, alias="ADMISSION_QUEUE_TIMEOUT")
+
+    # Javob siqish sozlamalari
+    compression_min_size: int = Field(default=1024, alias="COMPRESSION_MIN_SIZE")
+    compression_level: int = Field(default=6, alias="COMPRESSION_LEVEL")
+
+    # Mahalliy vakansiyalar indeksi
+    vacancy_index_enabled: bool = Field(default=True, alias="VACANCY_INDEX_ENABLED")
+
+    # Moslik bahosi uchun rezyume profili (matn yoki fayl)
+    resume_profile: str = Field(default="", alias="RESUME_PROFILE")
+    resume_profile_file: Optional[Path] = Field(default=None, alias="RESUME_PROFILE_FILE")
+
+    # Deyarli bir xil vakansiyalarni aniqlash (MinHash)
+    dedup_enabled: bool = Field(default=True, alias="DEDUP_ENABLED")
+    dedup_threshold: float = Field(default=0.8, alias="DEDUP_THRESHOLD")
+    apply_refuse_duplicates: bool = Field(default=False, alias="APPLY_REFUSE_DUPLICATES")
+
+    # Javob berish strategiyalarini tarixiy muvaffaqiyat bo'yicha tartiblash
+    apply_learn_strategy_order: bool = Field(default=True, alias="APPLY_LEARN_STRATEGY_ORDER")
+    # Statistikaga qaramay standart tartibni sinash ehtimoli (0 — o'chirilgan)
+    apply_strategy_explore_rate: float = Field(default=0.1, alias="APPLY_STRATEGY_EXPLORE_RATE")
+
     @property
     def session_file(self) -> Path:
         """Playwright sessiya yo'li."""
         return self.n8n_files_dir / "hh_session.json"
 
+    @property
+    def strategy_stats_file(self) -> Path:
+        """Javob berish strategiyalari statistikasi (JSON) yo'li."""
+        return self.n8n_files_dir / "apply_strategy_stats.json"
+
+    @property
+    def fixture_store_dir(self) -> Path:
+        """Yozib olingan fiksturalar katalogi."""
+        return self.fixtures_dir or self.n8n_files_dir / "fixtures"
+
+    @property
+    def vacancy_index_file(self) -> Path:
+        """Vakansiyalar FTS indeksi (SQLite) yo'li."""
+        return self.n8n_files_dir / "vacancies.db"
+
+    @property
+    def signature_store_file(self) -> Path:
+        """Vakansiyalar MinHash imzolari ombori (SQLite) yo'li."""
+        return self.n8n_files_dir / "vacancy_signatures.db"
+
     def ensure_dirs(self) -> None:
         """Agar sessiya papkasi mavjud bo'lmasa, uni yaratamiz."""
         self.n8n_files_dir.mkdir(parents=True, exist_ok=True)
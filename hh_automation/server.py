@@ -1,13 +1,32 @@
+# Birinchi import bo'lishi shart: startup moduli import paytida jarayon vaqtini
+# belgilaydi, shuning uchun "imports" o'lchovi qolgan importlarni ham qamraydi
+from .startup import startup_metrics
+
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, HttpUrl
 
+from .admission import AdmissionController, AdmissionRejected
+from .compression import json_response
 from .config import get_settings
-from .services import browser_manager, VacancySearchService, VacancyApplyService
+from .services import (
+    BrowserState,
+    SessionExpiredError,
+    browser_manager,
+    duplicate_detector,
+    relevance_scorer,
+    session_checker,
+    vacancy_index,
+    VacancySearchService,
+    VacancyApplyService,
+)
+from .services.search import VACANCY_FIELDS, project_vacancies
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,11 +35,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger("HHServer")
 
+startup_metrics.mark("imports")
+
 
 class ApplyRequest(BaseModel):
     """Vakansiyaga arizaning so'rov tanasi."""
     url: HttpUrl
     message: str = ""
+    refuse_duplicates: Optional[bool] = None
 
 
 class ApplyResponse(BaseModel):
@@ -35,11 +57,18 @@ class ErrorResponse(BaseModel):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Brauzer menejeri ishga tushmoqda...")
-    await browser_manager.start()
+    logger.info("Brauzer menejeri fonda ishga tushmoqda...")
+    browser_manager.start_in_background()
+    browser_manager.start_session_probe()
+    # uvicorn lifespan ni soket ochilishidan oldin bajaradi: bu tinglash vaqti emas,
+    # ilova tayyor bo'lgan vaqt (haqiqiy tinglash vaqtini bench_startup tashqaridan o'lchaydi)
+    startup_metrics.mark("lifespan_ready")
+    logger.info(f"Ilova ishga tushirildi ({startup_metrics.get('lifespan_ready'):.2f} s)")
     yield
     logger.info("Brauzer menejeri o‘chirilmoqda...")
     await browser_manager.stop()
+    vacancy_index.close()
+    duplicate_detector.close()
 
 
 app = FastAPI(
@@ -62,30 +91,184 @@ app.add_middleware(
 search_service = VacancySearchService()
 apply_service = VacancyApplyService()
 
+# Har bir so'rov o'z brauzer kontekstini ochadi, shuning uchun parallellik cheklanadi
+_settings = get_settings()
+search_admission = AdmissionController(
+    "search",
+    limit=_settings.search_concurrency,
+    queue_size=_settings.search_queue_size,
+    queue_timeout=_settings.admission_queue_timeout
+)
+apply_admission = AdmissionController(
+    "apply",
+    limit=_settings.apply_concurrency,
+    queue_size=_settings.apply_queue_size,
+    queue_timeout=_settings.admission_queue_timeout
+)
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+# /search va indeksdan qaytariladigan qo'shimcha maydonlar
+SEARCH_FIELDS = VACANCY_FIELDS + ("score",)
+INDEXED_VACANCY_FIELDS = ("id", "title", "url", "employer", "description", "scraped_at", "rank")
+
+
+def _parse_fields(
+    fields: Optional[str],
+    allowed: tuple[str, ...] = VACANCY_FIELDS
+) -> Optional[list[str]]:
+    """'title,url,id' ko'rinishidagi parametrni maydonlar ro'yxatiga aylantirish."""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Noma'lum maydonlar: {', '.join(unknown)}. Mavjud: {', '.join(allowed)}"
+        )
+    return names
+
+
+def _require_session() -> None:
+    """Sessiya o'lik bo'lsa, brauzerni ishga solmasdan 401 qaytarish."""
+    if browser_manager.mode == "replay":
+        return
+    try:
+        session_checker.validate()
+    except (FileNotFoundError, SessionExpiredError) as e:
+        logger.warning(f"Sessiya yaroqsiz: {e}")
+        raise HTTPException(status_code=401, detail=str(e))
+
 
 @app.get("/search")
 async def search_vacancies(
+    request: Request,
     text: str = Query(default="Frontend", description="Search query text"),
-    page: int = Query(default=0, ge=0, description="Sahifa raqami (0-indexlangan)")
-) -> list[dict]:
+    page: int = Query(default=0, ge=0, description="Sahifa raqami (0-indexlangan)"),
+    fields: Optional[str] = Query(
+        default=None,
+        description=f"Vergul bilan ajratilgan maydonlar ({', '.join(SEARCH_FIELDS)})"
+    ),
+    description_limit: Optional[int] = Query(
+        default=None, ge=0, description="Tavsif matnining maksimal uzunligi (harflarda)"
+    ),
+    min_score: Optional[float] = Query(
+        default=None, ge=0, le=1, description="Rezyume profiliga minimal moslik bahosi (0..1)"
+    ),
+    duplicates: str = Query(
+        default="mark",
+        pattern="^(mark|collapse)$",
+        description="Dublikatlar: 'mark' — duplicate_of bilan belgilash, 'collapse' — olib tashlash"
+    )
+) -> Response:
     """
     HH.ru da vakansiyalarni qidirish.
     
     Sarlavha, URL, ish beruvchi va tavsif bilan vakansiyalar ro'yxatini qaytaradi.
+    Rezyume profili sozlangan bo'lsa, har bir vakansiyaga `score` qo'shiladi va
+    `min_score` dan past bo'lganlari tashlab yuboriladi.
+    Avval ko'rilgan vakansiyalarning nusxalari `duplicate_of` bilan belgilanadi
+    yoki `duplicates=collapse` bo'lsa olib tashlanadi.
+    `fields` orqali faqat kerakli maydonlarni so'rash mumkin; javob
+    Accept-Encoding bo'yicha gzip yoki brotli bilan siqiladi.
     """
     logger.info(f"Qidiruv so'rovnomasi: matn='{text}', sahifa={page}")
+    selected_fields = _parse_fields(fields, SEARCH_FIELDS)
+    _require_session()
+    if min_score is not None and not relevance_scorer.enabled:
+        raise HTTPException(
+            status_code=400,
+            detail="min_score uchun RESUME_PROFILE yoki RESUME_PROFILE_FILE sozlanishi kerak"
+        )
     
+    async with search_admission.slot():
+        try:
+            vacancies = await search_service.search(query=text, page_num=page)
+        except (FileNotFoundError, SessionExpiredError) as e:
+            raise HTTPException(status_code=401, detail=str(e))
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            logger.error(f"Qidiruv amalga oshmadi: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=str(e))
+
+    startup_metrics.mark("time_to_first_search")
+
+    if duplicates == "collapse":
+        vacancies = [vacancy for vacancy in vacancies if not vacancy.get("duplicate_of")]
+
+    scores = relevance_scorer.score(vacancies)
+    if scores is not None:
+        vacancies = [
+            {**vacancy, "score": round(score, 4)}
+            for vacancy, score in zip(vacancies, scores)
+        ]
+        if min_score is not None:
+            total = len(vacancies)
+            vacancies = [vacancy for vacancy in vacancies if vacancy["score"] >= min_score]
+            logger.info(f"min_score={min_score}: {total} tadan {len(vacancies)} ta vakansiya qoldi")
+
+    settings = get_settings()
+    return json_response(
+        project_vacancies(vacancies, selected_fields, description_limit),
+        accept_encoding=request.headers.get("accept-encoding", ""),
+        min_size=settings.compression_min_size,
+        level=settings.compression_level
+    )
+
+
+@app.get("/vacancies/query")
+async def query_vacancies(
+    request: Request,
+    q: Optional[str] = Query(default=None, description="Kalit so'zlar (sarlavha, ish beruvchi, tavsif)"),
+    employer: Optional[str] = Query(default=None, description="Ish beruvchi nomining bir qismi"),
+    since: Optional[datetime] = Query(default=None, description="Shu vaqtdan keyin yig'ilganlar (ISO 8601)"),
+    until: Optional[datetime] = Query(default=None, description="Shu vaqtgacha yig'ilganlar (ISO 8601)"),
+    limit: int = Query(default=50, ge=1, le=1000, description="Maksimal natijalar soni"),
+    offset: int = Query(default=0, ge=0, description="O'tkazib yuboriladigan natijalar soni"),
+    fields: Optional[str] = Query(default=None, description="Vergul bilan ajratilgan maydonlar"),
+    description_limit: Optional[int] = Query(
+        default=None, ge=0, description="Tavsif matnining maksimal uzunligi (harflarda)"
+    )
+) -> Response:
+    """
+    Mahalliy indeksdan oldin yig'ilgan vakansiyalarni qidirish.
+
+    Brauzerni ishga tushirmaydi. Kalit so'zlar berilsa, natijalar BM25
+    bo'yicha tartiblanadi, aks holda eng yangilari birinchi keladi.
+    """
+    selected_fields = _parse_fields(fields, INDEXED_VACANCY_FIELDS)
+
     try:
-        vacancies = await search_service.search(query=text, page_num=page)
-        return vacancies
-    except FileNotFoundError as e:
-        raise HTTPException(status_code=401, detail=str(e))
-    except RuntimeError as e:
-        raise HTTPException(status_code=503, detail=str(e))
+        vacancies = await vacancy_index.query(
+            keywords=q,
+            employer=employer,
+            since=since,
+            until=until,
+            limit=limit,
+            offset=offset
+        )
     except Exception as e:
-        logger.error(f"Qidiruv amalga oshmadi: {e}", exc_info=True)
+        logger.error(f"Indeksdan qidirish amalga oshmadi: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    settings = get_settings()
+    return json_response(
+        project_vacancies(vacancies, selected_fields, description_limit),
+        accept_encoding=request.headers.get("accept-encoding", ""),
+        min_size=settings.compression_min_size,
+        level=settings.compression_level
+    )
+
 
 @app.post("/apply", response_model=ApplyResponse)
 async def apply_to_vacancy(request: ApplyRequest) -> ApplyResponse:
@@ -95,21 +278,47 @@ async def apply_to_vacancy(request: ApplyRequest) -> ApplyResponse:
     Javob natijasi holatini va xabarini qaytaradi.
     """
     logger.info(f"Arizani qabul qilish so'rovnomasi: url={request.url}")
+    _require_session()
     
-    try:
-        result = await apply_service.apply(str(request.url), request.message)
-        return ApplyResponse(**result)
-    except Exception as e:
-        logger.error(f"Arizani qabul qilish amalga oshmadi: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+    refuse_duplicates = (
+        request.refuse_duplicates
+        if request.refuse_duplicates is not None
+        else get_settings().apply_refuse_duplicates
+    )
+
+    async with apply_admission.slot():
+        try:
+            result = await apply_service.apply(str(request.url), request.message, refuse_duplicates)
+            return ApplyResponse(**result)
+        except Exception as e:
+            logger.error(f"Arizani qabul qilish amalga oshmadi: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/health")
 async def health_check() -> dict:
+    """
+    Server holati.
+
+    `status`: `starting` — brauzer hali ishga tushmoqda, `ready` — so'rovlarga
+    tayyor, `degraded` — brauzer ishga tushmadi (keyingi so'rov qayta urinadi).
+    """
     settings = get_settings()
+    state = browser_manager.state
+    if state in (BrowserState.READY, BrowserState.STARTING):
+        status = state.value
+    else:
+        status = BrowserState.DEGRADED.value
     return {
-        "status": "ok",
+        "status": status,
+        "browser": browser_manager.status(),
+        "startup": startup_metrics.as_dict(),
+        "admission": {
+            "search": search_admission.stats(),
+            "apply": apply_admission.stats(),
+        },
         "session_exists": settings.session_file.exists(),
+        "session": session_checker.status(),
         "version": "2.0.0"
     }
 
@@ -121,7 +330,8 @@ def run():
     
     logger.info(f"HH Avtomatlashtirish API http://{settings.server_host}:{settings.server_port} da ishga tushmoqda")
     logger.info("Tugunlar:")
-    logger.info("  GET  /search?text=Frontend&page=0")
+    logger.info("  GET  /search?text=Frontend&page=0&fields=id,title,url")
+    logger.info("  GET  /vacancies/query?q=python&employer=...&since=2024-01-01")
     logger.info("  POST /apply  { 'url': '...', 'message': '...' }")
     logger.info("  GET  /health")
     logger.info("  GET  /docs  (Swagger UI)")
@@ -1,5 +1,34 @@
-from .browser import BrowserManager, browser_manager
+from .replay import FixtureStore, StageRecorder, fixture_store
+from .strategy_stats import StrategyStats, strategy_stats
+from .page_state import PageSnapshot, take_snapshot
+from .session import SessionChecker, SessionExpiredError, session_checker
+from .browser import BrowserManager, BrowserState, browser_manager
 from .search import VacancySearchService
 from .apply import VacancyApplyService
+from .index import VacancyIndex, vacancy_index
+from .scoring import RelevanceScorer, relevance_scorer
+from .dedup import DuplicateDetector, duplicate_detector
 
-__all__ = ["BrowserManager", "browser_manager", "VacancySearchService", "VacancyApplyService"]
+__all__ = [
+    "SessionChecker",
+    "SessionExpiredError",
+    "session_checker",
+    "BrowserManager",
+    "BrowserState",
+    "browser_manager",
+    "VacancySearchService",
+    "VacancyApplyService",
+    "VacancyIndex",
+    "vacancy_index",
+    "RelevanceScorer",
+    "relevance_scorer",
+    "DuplicateDetector",
+    "duplicate_detector",
+    "FixtureStore",
+    "StageRecorder",
+    "fixture_store",
+    "StrategyStats",
+    "strategy_stats",
+    "PageSnapshot",
+    "take_snapshot",
+]
@@ -1,13 +1,35 @@
 """Vakansiyalarga javob berish uchun asinxron xizmat."""
 
+from __future__ import annotations
+
 import logging
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
-
-from playwright.async_api import Page
+from typing import TYPE_CHECKING, Optional
 
+from ..config import get_settings
 from .browser import browser_manager
+from .dedup import duplicate_detector
+from .replay import REPLAY, StageRecorder, fixture_name
+from .page_state import (
+    COVER_LETTER_LINK,
+    DROPDOWN_ARROW,
+    LETTER_OPTION_TEXT,
+    POPUP,
+    POPUP_LETTER_INPUT,
+    POPUP_SUBMIT,
+    RESPONSE_LINK_BOTTOM,
+    RESPONSE_LINK_TOP,
+    SEND_BUTTON_TEXT,
+    PageSnapshot,
+    take_snapshot,
+)
+from .search import extract_vacancy_id
+from .session import SessionExpiredError
+from .strategy_stats import strategy_stats
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 logger = logging.getLogger(__name__)
 
@@ -32,16 +54,27 @@ class ApplyResult:
 class VacancyApplyService:
     """HH.ru da vakansiyalarga javob berish xizmati."""
 
-    async def _check_bot_protection(self, page: Page) -> bool:
-        """Bot himoyasi ishga tushishi (kapcha) tekshirish."""
-        title = await page.title()
-        content = await page.content()
-        return "captcha" in title.lower() or "robot" in content.lower()
+    # Qo'llash xatini albatta yuboradigan strategiyalar; xat berilganda
+    # standart tugma (xat yuborilishi kafolatlanmagan) har doim ulardan keyin sinaladi
+    _LETTER_STRATEGIES = ("cover_letter_link", "dropdown")
+
+    def __init__(self) -> None:
+        self._settings = get_settings()
+        # Standart tartib; tarixiy statistika bo'yicha qayta tartiblanadi
+        self._strategies = {
+            "cover_letter_link": self._try_cover_letter_link,
+            "dropdown": self._try_dropdown_apply,
+            "standard_button": self._try_standard_button,
+        }
 
-    async def _check_already_applied(self, page: Page) -> bool:
-        """Ushbu vakansiyaga javob berilganligini tekshirish."""
-        locator = page.locator("text=Siz javob berdingiz")
-        return await locator.count() > 0
+    @staticmethod
+    def _is_applicable(name: str, snapshot: PageSnapshot, message: str) -> bool:
+        """Strategiyani joriy sahifa holatida sinash mumkinmi."""
+        if name == "standard_button":
+            return snapshot.has_response_link
+        if name == "dropdown":
+            return snapshot.dropdown_arrow and bool(message)
+        return snapshot.cover_letter_link and bool(message)
 
     async def _fill_cover_letter_modal(
         self,
@@ -56,21 +89,18 @@ class VacancyApplyService:
         """
         try:
             logger.debug("Qo'llash modali kutilmoqda...")
-            await page.wait_for_selector("[data-qa='vacancy-response-popup']", timeout=5000)
+            await page.wait_for_selector(POPUP, timeout=5000)
             await page.wait_for_timeout(1000)
+            snapshot = await take_snapshot(page)
             
-            letter_area = page.locator(
-                "textarea[data-qa='vacancy-response-popup-form-letter-input']"
-            )
-            if await letter_area.count() > 0:
+            if snapshot.popup_letter_input:
                 logger.debug(f"Qo'llash xatini to'ldirish ({len(message)} harf)")
-                await letter_area.fill(message)
+                await page.locator(POPUP_LETTER_INPUT).fill(message)
             else:
                 logger.warning("Modal oynasida qo'llash xatining maydoni topilmadi")
             
-            submit_btn = page.locator("button[data-qa='vacancy-response-submit-popup']")
-            if await submit_btn.count() > 0:
-                await submit_btn.click()
+            if snapshot.popup_submit:
+                await page.locator(POPUP_SUBMIT).click()
                 await page.wait_for_timeout(3000)
                 return ApplyResult(ApplyStatus.SUCCESS, "Qo'llash xati bilan javob berildi")
             else:
@@ -83,14 +113,13 @@ class VacancyApplyService:
     async def _try_cover_letter_link(
         self,
         page: Page,
-        message: str
+        message: str,
+        snapshot: PageSnapshot
     ) -> Optional[ApplyResult]:
         """'Qo'llash xatini yozish' havolasi orqali javob berish urinishi."""
-        cover_letter_link = page.locator("a:has-text('Написать сопроводительное')")
-        
-        if await cover_letter_link.count() > 0 and message:
+        if snapshot.cover_letter_link and message:
             logger.debug("'Qo'llash xati yozish' havolasi topildi, bosish...")
-            await cover_letter_link.first.click()
+            await page.locator(COVER_LETTER_LINK).first.click()
             result = await self._fill_cover_letter_modal(page, message)
             if result:
                 return result
@@ -100,22 +129,18 @@ class VacancyApplyService:
     async def _try_dropdown_apply(
         self,
         page: Page,
-        message: str
+        message: str,
+        snapshot: PageSnapshot
     ) -> Optional[ApplyResult]:
         """Qo'llash xatiga ega belgili menyu orqali javob berish urinishi."""
-        dropdown_arrow = page.locator(
-            "[data-qa='vacancy-response-link-top'] + button, "
-            "[data-qa='vacancy-response-link-bottom'] + button"
-        )
-        
-        if await dropdown_arrow.count() > 0 and message:
+        if snapshot.dropdown_arrow and message:
             logger.debug("Belgili menyu topildi, kengaytirish...")
-            await dropdown_arrow.first.click()
+            await page.locator(DROPDOWN_ARROW).first.click()
             await page.wait_for_timeout(500)
             
-            with_letter_option = page.locator("text=Kuzatuv xati bilan")
-            if await with_letter_option.count() > 0:
-                await with_letter_option.first.click()
+            # Menyu ochildi — DOM o'zgardi, holat qayta olinadi
+            if (await take_snapshot(page)).letter_option:
+                await page.locator(f"text={LETTER_OPTION_TEXT}").first.click()
                 result = await self._fill_cover_letter_modal(page, message)
                 if result:
                     return result
@@ -125,45 +150,156 @@ class VacancyApplyService:
     async def _try_post_apply_letter(
         self,
         page: Page,
-        message: str
+        message: str,
+        snapshot: PageSnapshot
     ) -> Optional[ApplyResult]:
         """Javob berish o'tkazilganidan so'ng qo'llash xatini to'ldirish urinishi."""
-        resume_delivered = page.locator("text=Rezyume yetkazildi")
-        
-        if await resume_delivered.count() > 0 or await page.locator("textarea").count() > 0:
+        if snapshot.resume_delivered or snapshot.textarea:
             logger.debug("Javob berish utkazilgan o'tkazilgan ekran topildi")
             
-            letter_area = page.locator("textarea")
-            if await letter_area.count() > 0 and message:
-                await letter_area.first.fill(message)
+            if snapshot.textarea and message:
+                await page.locator("textarea").first.fill(message)
                 
-                submit_btn = page.locator("button:has-text('Yuborish')")
-                if await submit_btn.count() > 0:
-                    await submit_btn.first.click()
+                if snapshot.send_button:
+                    await page.locator(f"button:has-text('{SEND_BUTTON_TEXT}')").first.click()
                     await page.wait_for_timeout(2000)
                     return ApplyResult(ApplyStatus.SUCCESS, "Javob berish o'tkazilganidan so'ng qo'llash xati bilan javob berildi")
         
         return None
 
-    async def _check_application_success(self, page: Page) -> bool:
-        """Javob berish muvaffaqiyatli yuborilganligini tekshirish."""
-        success_texts = [
-            "text=Javob topshirildi",
-            "text=Siz javob berdingiz",
-            "text=Rezyume yetkazildi"
-        ]
-        for selector in success_texts:
-            if await page.locator(selector).count() > 0:
-                return True
-        return False
-
-    async def apply(self, url: str, message: str = "") -> dict:
+    async def _try_standard_button(
+        self,
+        page: Page,
+        message: str,
+        snapshot: PageSnapshot
+    ) -> Optional[ApplyResult]:
+        """Standart javob berish tugmasi, so'ng kerak bo'lsa qo'llash xati."""
+        if not snapshot.has_response_link:
+            return None
+
+        # Strategiya 3: Standart javob berish tugmasi
+        logger.debug("Standart javob berish tugmasini bosamiz...")
+        selector = RESPONSE_LINK_TOP if snapshot.response_link_top else RESPONSE_LINK_BOTTOM
+        await page.locator(selector).first.click()
+        await page.wait_for_timeout(2000)
+
+        # Tugma bosildi — DOM o'zgardi, holat qayta olinadi
+        snapshot = await take_snapshot(page)
+
+        # Strategiya 4: Javob berish o'tkazilgandan so'ng qo'llash xati
+        result = await self._try_post_apply_letter(page, message, snapshot)
+        if result:
+            return result
+
+        # Javob berish muvaffaqiyatligini tekshirish
+        if snapshot.success:
+            return ApplyResult(ApplyStatus.SUCCESS, "Muvaffaqiyatli javob berildi")
+        else:
+            return ApplyResult(
+                ApplyStatus.SUCCESS,
+                "Javob berildi (holati aniq emas)"
+            )
+
+    def _strategy_order(self, fingerprint: str, message: str, learn: bool) -> list[str]:
+        """Strategiyalar tartibi: xatli strategiyalar statistika bo'yicha, standart tugma oxirida."""
+        if not message:
+            return ["standard_button"]
+        letter_strategies = list(self._LETTER_STRATEGIES)
+        if learn:
+            letter_strategies = strategy_stats.order(
+                fingerprint, letter_strategies, explore=self._settings.apply_strategy_explore_rate
+            )
+        return letter_strategies + ["standard_button"]
+
+    @staticmethod
+    async def _verify_success(page: Page) -> bool:
+        """Javob haqiqatan qabul qilinganini sahifadagi belgilar bo'yicha tekshirish."""
+        try:
+            return (await take_snapshot(page)).success
+        except Exception as e:
+            logger.debug(f"Natijani tekshirib bo'lmadi: {e}")
+            return False
+
+    async def _find_duplicate(self, url: str) -> Optional[str]:
+        """Vakansiya qidiruvda dublikat deb belgilanganmi — asl vakansiya kalitini qaytarish."""
+        try:
+            return await duplicate_detector.duplicate_of(extract_vacancy_id(url) or url)
+        except Exception as e:
+            logger.warning(f"Dublikatni tekshirish muvaffaqsiz bo'ldi {url}: {e}")
+            return None
+
+    async def _apply_on_page(
+        self,
+        page: Page,
+        url: str,
+        message: str,
+        stages: StageRecorder
+    ) -> ApplyResult:
+        """Ochilgan sahifada javob berish strategiyalarini bajarish."""
+        # Vakansiyaga o'tish
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        except Exception as e:
+            logger.warning(f"Navigatsiya timeout: {e}")
+            # Baraye ham davom ettiring, sahifa etarli darajada yuklanishi mumkin
+        await stages.mark("loaded")
+
+        # Barcha qarorlar uchun sahifa holati bitta chaqiruvda olinadi;
+        # u faqat DOM ni o'zgartiruvchi harakatlardan keyin qayta olinadi
+        snapshot = await take_snapshot(page)
+
+        # Bot himoyasi tekshirish
+        if snapshot.captcha:
+            return ApplyResult(
+                ApplyStatus.ERROR,
+                "Bot himoyasi ishga tushdi (kapcha)"
+            )
+
+        # Oldindan javob berilganligini tekshirish
+        if snapshot.already_applied:
+            return ApplyResult(ApplyStatus.SKIPPED, "Allaqachon javob berilgan")
+
+        await stages.mark("checks")
+
+        # Strategiyalar: qo'llash xati havolasi, belgili ro'yxat, standart tugma
+        # (+ javobdan keyingi xat). Shu tuzilishda oldin yutgan xatli strategiya
+        # birinchi sinaladi. Replay da statistika o'zgartirilmaydi (natija deterministik bo'lishi uchun).
+        learn = self._settings.apply_learn_strategy_order and browser_manager.mode != REPLAY
+        fingerprint = snapshot.fingerprint(message)
+        strategies = self._strategy_order(fingerprint, message, learn)
+        logger.debug(f"Sahifa tuzilishi: {fingerprint}; strategiyalar tartibi: {strategies}")
+
+        for name in strategies:
+            if not self._is_applicable(name, snapshot, message):
+                continue
+            result = await self._strategies[name](page, message, snapshot)
+            await stages.mark(name)
+            if learn:
+                # Faqat sahifada tasdiqlangan muvaffaqiyat yutuq hisoblanadi
+                verified = (
+                    result is not None
+                    and result.status == ApplyStatus.SUCCESS
+                    and await self._verify_success(page)
+                )
+                strategy_stats.record(fingerprint, name, verified)
+            if result:
+                return result
+            # Strategiya sahifada harakat qildi, lekin natija bermadi — holat eskirdi
+            snapshot = await take_snapshot(page)
+
+        return ApplyResult(
+            ApplyStatus.ERROR,
+            "Javob berish tugmasi topilmadi"
+        )
+
+    async def apply(self, url: str, message: str = "", refuse_duplicates: bool = False) -> dict:
         """
         Vakansiyaga ixtiyoriy qo'llash xati bilan javob bering.
         
         Argumentlar:
             url: Vakansiya URL manzili.
             message: Ixtiyoriy qo'llash xatining matni.
+            refuse_duplicates: Qidiruvda dublikat deb belgilangan vakansiyani o'tkazib yuborish.
             
         Qaytaradi:
             Holat va xabar bilan lug'at.
@@ -172,67 +308,27 @@ class VacancyApplyService:
         if message:
             logger.debug(f"Qo'llash xati: {len(message)} harf")
 
-        try:
-            async with browser_manager.get_page(use_session=True) as page:
-                # Vakansiyaga o'tish
-                try:
-                    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-                except Exception as e:
-                    logger.warning(f"Navigatsiya timeout: {e}")
-                    # Baraye ham davom ettiring, sahifa etarli darajada yuklanishi mumkin
-
-                # Bot himoyasi tekshirish
-                if await self._check_bot_protection(page):
-                    return ApplyResult(
-                        ApplyStatus.ERROR,
-                        "Bot himoyasi ishga tushdi (kapcha)"
-                    ).to_dict()
-
-                # Oldindan javob berilganligini tekshirish
-                if await self._check_already_applied(page):
-                    return ApplyResult(ApplyStatus.SKIPPED, "Allaqachon javob berilgan").to_dict()
-
-                # Strategiya 1: Qo'llash xati havolasi orqali urinish
-                result = await self._try_cover_letter_link(page, message)
-                if result:
-                    return result.to_dict()
+        if refuse_duplicates:
+            duplicate_of = await self._find_duplicate(url)
+            if duplicate_of:
+                return ApplyResult(
+                    ApplyStatus.SKIPPED,
+                    f"Dublikat vakansiya ({duplicate_of} nusxasi)"
+                ).to_dict()
 
-                # Javob berish tugmasini qidirish
-                apply_btn = page.locator("[data-qa='vacancy-response-link-top']")
-                if await apply_btn.count() == 0:
-                    apply_btn = page.locator("[data-qa='vacancy-response-link-bottom']")
+        fixture = fixture_name("apply", extract_vacancy_id(url) or url)
+        fixture_meta = {"kind": "apply", "url": url, "message": message}
 
-                if await apply_btn.count() == 0:
-                    return ApplyResult(
-                        ApplyStatus.ERROR,
-                        "Javob berish tugmasi topilmadi"
-                    ).to_dict()
-
-                # Strategiya 2: Belgili ro'yxat orqali qo'llash xati bilan urinish
-                result = await self._try_dropdown_apply(page, message)
-                if result:
-                    return result.to_dict()
-
-                # Strategiya 3: Standart javob berish tugmasi
-                logger.debug("Standart javob berish tugmasini bosamiz...")
-                await apply_btn.first.click()
-                await page.wait_for_timeout(2000)
+        try:
+            async with browser_manager.get_page(
+                use_session=True, fixture=fixture, fixture_meta=fixture_meta
+            ) as page:
+                stages = StageRecorder(page, fixture, browser_manager.mode)
+                result = (await self._apply_on_page(page, url, message, stages)).to_dict()
+                stages.finish(result)
+                return result
 
-                # Strategiya 4: Javob berish o'tkazilgandan so'ng qo'llash xati
-                result = await self._try_post_apply_letter(page, message)
-                if result:
-                    return result.to_dict()
-
-                # Javob berish muvaffaqiyatligini tekshirish
-                if await self._check_application_success(page):
-                    return ApplyResult(ApplyStatus.SUCCESS, "Muvaffaqiyatli javob berildi").to_dict()
-                else:
-                    return ApplyResult(
-                        ApplyStatus.SUCCESS,
-                        "Javob berildi (holati aniq emas)"
-                    ).to_dict()
-
-        except FileNotFoundError as e:
+        except (FileNotFoundError, SessionExpiredError) as e:
             return ApplyResult(ApplyStatus.ERROR, str(e)).to_dict()
         except Exception as e:
             logger.error(f"Qo'llash muvaffaqsiz bo'ldi: {e}", exc_info=True)
@@ -1,18 +1,33 @@
 """Playwright brauzer asinkron boshqaruvi"""
 
+from __future__ import annotations
+
 import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
+from enum import Enum
 from pathlib import Path
-from typing import AsyncGenerator, Optional
-
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
 
 from ..config import get_settings
+from .replay import LIVE, RECORD, REPLAY, ReplayRouter, fixture_store, sanitize_har
+from .session import session_checker
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
 
 logger = logging.getLogger(__name__)
 
 
+class BrowserState(str, Enum):
+    """Brauzer tayyorlik holatlari."""
+    STOPPED = "stopped"
+    STARTING = "starting"
+    READY = "ready"
+    DEGRADED = "degraded"
+
+
 class BrowserManager:
     """
     Playwright brauzeri hayot tsiklini boshqaradi.
@@ -23,60 +38,235 @@ class BrowserManager:
         self._browser: Optional[Browser] = None
         self._lock = asyncio.Lock()
         self._settings = get_settings()
+        self._state = BrowserState.STOPPED
+        self._last_error: Optional[str] = None
+        self._launch_seconds: Optional[float] = None
+        self._start_task: Optional[asyncio.Task] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._user_agent: Optional[str] = None
+
+    @property
+    def state(self) -> BrowserState:
+        return self._state
+
+    @property
+    def mode(self) -> str:
+        """Brauzer rejimi: live, record yoki replay."""
+        return self._settings.browser_mode
+
+    def status(self) -> dict:
+        """Brauzer holati /health uchun."""
+        return {
+            "state": self._state.value,
+            "launch_seconds": round(self._launch_seconds, 3) if self._launch_seconds is not None else None,
+            "error": self._last_error,
+        }
 
     async def start(self) -> None:
         """Playwright va brauzer ishga tushirishini boshlash."""
         async with self._lock:
-            if self._playwright is None:
-                logger.info("Playwright ishga tushmoqda...")
-                self._playwright = await async_playwright().start()
+            if self._browser is not None:
+                return
+
+            # Playwright og'ir import — server tinglashni boshlagandan keyin yuklanadi
+            from playwright.async_api import async_playwright
+
+            self._state = BrowserState.STARTING
+            started = time.perf_counter()
+            try:
+                if self._playwright is None:
+                    logger.info("Playwright ishga tushmoqda...")
+                    self._playwright = await async_playwright().start()
                 self._browser = await self._playwright.chromium.launch(
                     headless=self._settings.browser_headless,
                     slow_mo=self._settings.browser_slow_mo
                 )
-                logger.info("Brauzer muvaffaqiyatli ishga tushdi")
+            except Exception as e:
+                self._state = BrowserState.DEGRADED
+                self._last_error = str(e)
+                raise
+
+            self._launch_seconds = time.perf_counter() - started
+            self._state = BrowserState.READY
+            self._last_error = None
+            logger.info(f"Brauzer muvaffaqiyatli ishga tushdi ({self._launch_seconds:.2f} s)")
+
+    async def _start_background(self) -> None:
+        try:
+            await self.start()
+        except Exception as e:
+            logger.error(f"Brauzerni fonda ishga tushirish muvaffaqsiz bo'ldi: {e}", exc_info=True)
+
+    def start_in_background(self) -> None:
+        """
+        Brauzerni fonda ishga tushirish.
+
+        Server darhol so'rovlarni qabul qila boshlaydi; brauzer kerak bo'lgan
+        birinchi so'rov ishga tushish tugashini kutadi.
+        """
+        if self._start_task is None or self._start_task.done():
+            self._state = BrowserState.STARTING
+            self._start_task = asyncio.create_task(self._start_background())
+
+    async def _ensure_started(self) -> None:
+        """Brauzer tayyor bo'lishini kutish, kerak bo'lsa qayta ishga tushirish."""
+        if self._browser is not None:
+            return
+        if self._start_task is not None and not self._start_task.done():
+            await asyncio.shield(self._start_task)
+        if self._browser is None:
+            try:
+                await self.start()
+            except Exception as e:
+                raise RuntimeError(f"Brauzer ishga tushmadi: {e}") from e
+
+    async def _browser_user_agent(self) -> str:
+        """Brauzer sahifalari yuboradigan User-Agent (bir marta aniqlanadi)."""
+        if self._user_agent is None:
+            context = await self._browser.new_context()
+            try:
+                page = await context.new_page()
+                self._user_agent = await page.evaluate("navigator.userAgent")
+            finally:
+                await context.close()
+        return self._user_agent
+
+    async def probe_session(self) -> Optional[bool]:
+        """
+        Sessiyani arzon avtorizatsiyalangan HTTP so'rov bilan tekshirish.
+
+        Sahifa ochilmaydi: Playwright APIRequestContext sessiya cookie lari va
+        brauzer User-Agent i bilan bitta GET yuboradi. Faqat 401 yoki kirish
+        sahifasiga yo'naltirish sessiyani o'lik deb belgilaydi; 403 (bot
+        himoyasi) va boshqa javoblar natijani noaniq qoldiradi.
+
+        Qaytaradi:
+            True/False yoki aniqlab bo'lmasa (tarmoq xatosi, 403 va h.k.) None.
+        """
+        if session_checker.load() is None:
+            return None
+        await self._ensure_started()
+
+        request_context = await self._playwright.request.new_context(
+            storage_state=str(self._settings.session_file),
+            user_agent=await self._browser_user_agent()
+        )
+        try:
+            response = await request_context.get(
+                self._settings.session_probe_url,
+                max_redirects=0,
+                timeout=self._settings.page_timeout
+            )
+            location = response.headers.get("location", "")
+            if response.status == 401 or (
+                300 <= response.status < 400 and ("login" in location or "account" in location)
+            ):
+                valid: Optional[bool] = False
+            elif response.ok:
+                valid = True
+            else:
+                valid = None
+            detail = f"HTTP {response.status}" + (f" -> {location}" if location else "")
+        except Exception as e:
+            valid, detail = None, str(e)
+        finally:
+            await request_context.dispose()
+
+        session_checker.record_probe(valid, detail)
+        logger.info(f"Sessiya tekshiruvi: valid={valid} ({detail})")
+        return valid
+
+    async def _probe_loop(self, interval: int) -> None:
+        while True:
+            try:
+                await self.probe_session()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Sessiya tekshiruvi muvaffaqsiz bo'ldi: {e}")
+            await asyncio.sleep(interval)
+
+    def start_session_probe(self) -> None:
+        """Sessiyani davriy tekshirishni fonda boshlash (SESSION_PROBE_INTERVAL)."""
+        if self.mode == REPLAY:
+            # Replay to'liq oflayn — jonli saytga so'rov yuborilmaydi
+            return
+        interval = self._settings.session_probe_interval
+        if interval > 0 and (self._probe_task is None or self._probe_task.done()):
+            self._probe_task = asyncio.create_task(self._probe_loop(interval))
 
     async def stop(self) -> None:
+        for task in (self._probe_task, self._start_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
         async with self._lock:
             if self._browser:
                 await self._browser.close()
                 self._browser = None
+                self._user_agent = None
             if self._playwright:
                 await self._playwright.stop()
                 self._playwright = None
+            self._state = BrowserState.STOPPED
             logger.info("Brauzer to'xtatildi")
 
     def _validate_session(self) -> None:
-        """Sessiya faylining mavjudligi va to'g'riligi tekshiruvi."""
-        if not self._settings.session_file.exists():
-            raise FileNotFoundError(
-                f"Session file not found: {self._settings.session_file}. "
-                "Run 'python -m hh_automation.cli.login' first."
-            )
+        """Sessiya faylining mavjudligi va to'g'riligi tekshiruvi (navigatsiyasiz)."""
+        session_checker.validate()
 
     @asynccontextmanager
-    async def get_page(self, use_session: bool = True) -> AsyncGenerator[Page, None]:
+    async def get_page(
+        self,
+        use_session: bool = True,
+        fixture: Optional[str] = None,
+        fixture_meta: Optional[dict] = None
+    ) -> AsyncGenerator[Page, None]:
         """
         Shaxsiy sessiya holatiga ega brauzer sahifasini olish.
         
         Argumentlar:
             use_session: Saqlangan autentifikatsiya holatini yuklash kerakmi.
+            fixture: Fikstura nomi. record rejimida trafik shu nom bilan yoziladi,
+                replay rejimida esa shu yozuvdan ijro etiladi.
+            fixture_meta: record rejimida fikstura bilan saqlanadigan operatsiya ma'lumoti.
             
         Qaytaradi:
             Foydalanishga tayyorlanmish sozlanmış brauzer sahifasi.
         """
-        if not self._browser:
-            await self.start()
+        await self._ensure_started()
+
+        if self.mode == REPLAY and not fixture:
+            # Jonli rejimga jimgina o'tish haqiqiy sahifalarni ochib, tugmalarni bosishi mumkin
+            raise RuntimeError("Replay mode requires a fixture; refusing to open a live page")
+        mode = self.mode if fixture else LIVE
+        options: dict = {}
+        if use_session and mode != REPLAY:
+            self._validate_session()
+            options["storage_state"] = str(self._settings.session_file)
+        if mode == RECORD:
+            har_path = fixture_store.har_path(fixture)
+            har_path.parent.mkdir(parents=True, exist_ok=True)
+            options["record_har_path"] = str(har_path)
+            options["record_har_content"] = "embed"
+            if fixture_meta is not None:
+                fixture_store.write_json(fixture, "meta.json", fixture_meta)
+            logger.info(f"Trafik yozib olinmoqda: {har_path}")
 
         context: Optional[BrowserContext] = None
+        router: Optional[ReplayRouter] = None
         try:
-            if use_session:
-                self._validate_session()
-                context = await self._browser.new_context(
-                    storage_state=str(self._settings.session_file)
-                )
-            else:
-                context = await self._browser.new_context()
+            context = await self._browser.new_context(**options)
+
+            if mode == REPLAY:
+                har_path = fixture_store.har_path(fixture)
+                if not har_path.exists():
+                    raise FileNotFoundError(f"Fixture not found: {har_path}")
+                router = ReplayRouter(har_path, self._settings.replay_latency_ms)
+                await router.install(context)
 
             page = await context.new_page()
             page.set_default_timeout(self._settings.page_timeout)
@@ -86,6 +276,15 @@ class BrowserManager:
         finally:
             if context:
                 await context.close()
+            if mode == RECORD and context is not None:
+                # HAR kontekst yopilganda yoziladi; sessiya cookie lari fiksturada qolmasin
+                try:
+                    removed = sanitize_har(fixture_store.har_path(fixture))
+                    logger.debug(f"HAR dan {removed} ta maxfiy sarlavha olib tashlandi [{fixture}]")
+                except Exception as e:
+                    logger.warning(f"HAR ni tozalash muvaffaqsiz bo'ldi [{fixture}]: {e}")
+            if router is not None and router.misses:
+                logger.warning(f"Yozuvda topilmagan {len(router.misses)} ta so'rov bekor qilindi [{fixture}]")
 
     @asynccontextmanager
     async def get_interactive_context(self, headless: Optional[bool] = None) -> AsyncGenerator[tuple[BrowserContext, Page], None]:
@@ -95,6 +294,8 @@ class BrowserManager:
         Qaytaradi:
             Kortej (context, page)
         """
+        from playwright.async_api import async_playwright
+
         if headless is None:
             headless = self._settings.browser_headless
 
@@ -0,0 +1,233 @@
+"""MinHash/LSH orqali deyarli bir xil vakansiyalarni aniqlash."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from ..config import get_settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Mersenne tub soni: (a * x + b) uint64 da to'lib ketmaydi
+_PRIME = (1 << 31) - 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    vacancy_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    duplicate_of TEXT,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    vacancy_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lsh_buckets_lookup ON lsh_buckets(band, bucket);
+"""
+
+
+def _shingles(text: str, size: int) -> set[str]:
+    """Matnni so'z n-grammlariga (shingle) ajratish."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class DuplicateDetector:
+    """
+    Vakansiyalarning MinHash imzolarini saqlaydi va yangilarini ular bilan solishtiradi.
+
+    Imzo sarlavha, ish beruvchi va tavsifning so'z 3-grammlari bo'yicha
+    hisoblanadi. LSH bandlari nomzodlarni indeks orqali topadi, so'ng taxminiy
+    Jaccard o'xshashlik chegaradan yuqori bo'lsa, vakansiya dublikat deb
+    belgilanadi. Imzolar SQLite da saqlanadi, shuning uchun qayta ishga
+    tushirishlar orasida ham ishlaydi.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm bands ga qoldiqsiz bo'linishi kerak")
+        self._path = path
+        self._num_perm = num_perm
+        self._bands = bands
+        self._rows = num_perm // bands
+        self._shingle_size = shingle_size
+        self._seed = seed
+        self._settings = get_settings()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self._permutations: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    def _get_permutations(self) -> tuple[np.ndarray, np.ndarray]:
+        """MinHash permutatsiya koeffitsiyentlari (a, b)."""
+        if self._permutations is None:
+            import numpy as np
+
+            # Imzolar saqlanadigan bo'lgani uchun permutatsiyalar doimiy seed dan olinadi
+            rng = np.random.default_rng(self._seed)
+            self._permutations = (
+                rng.integers(1, _PRIME, size=self._num_perm, dtype=np.uint64),
+                rng.integers(0, _PRIME, size=self._num_perm, dtype=np.uint64),
+            )
+        return self._permutations
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            path = self._path or self._settings.signature_store_file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def signature(self, text: str) -> np.ndarray:
+        """Matnning MinHash imzosini hisoblash."""
+        import numpy as np
+
+        shingles = _shingles(text, self._shingle_size)
+        if not shingles:
+            return np.full(self._num_perm, _PRIME, dtype=np.uint64)
+        a, b = self._get_permutations()
+        prime = np.uint64(_PRIME)
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        ) % prime
+        permuted = (np.outer(a, hashes) + b[:, None]) % prime
+        return permuted.min(axis=1)
+
+    def _band_buckets(self, signature: np.ndarray) -> list[tuple[int, int]]:
+        buckets = []
+        for band in range(self._bands):
+            chunk = signature[band * self._rows:(band + 1) * self._rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            buckets.append((band, int.from_bytes(digest, "big", signed=True)))
+        return buckets
+
+    @staticmethod
+    def _text(vacancy: dict) -> str:
+        return " ".join(
+            vacancy.get(field, "") for field in ("title", "employer", "description")
+        )
+
+    def _check(self, key: str, url: str, text: str, threshold: float) -> Optional[str]:
+        import numpy as np
+
+        conn = self._connect()
+
+        row = conn.execute(
+            "SELECT duplicate_of FROM signatures WHERE vacancy_key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            return row[0]
+
+        signature = self.signature(text)
+        buckets = self._band_buckets(signature)
+
+        candidates: set[str] = set()
+        for band, bucket in buckets:
+            candidates.update(
+                candidate for (candidate,) in conn.execute(
+                    "SELECT vacancy_key FROM lsh_buckets WHERE band = ? AND bucket = ?",
+                    (band, bucket)
+                )
+            )
+
+        duplicate_of: Optional[str] = None
+        best = threshold
+        for candidate in candidates:
+            stored_signature, stored_duplicate_of = conn.execute(
+                "SELECT signature, duplicate_of FROM signatures WHERE vacancy_key = ?",
+                (candidate,)
+            ).fetchone()
+            similarity = float(np.mean(np.frombuffer(stored_signature, dtype=np.uint64) == signature))
+            if similarity >= best:
+                best = similarity
+                duplicate_of = stored_duplicate_of or candidate
+
+        with conn:
+            conn.execute(
+                "INSERT INTO signatures (vacancy_key, url, signature, duplicate_of, seen_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, url, signature.tobytes(), duplicate_of, time.time())
+            )
+            conn.executemany(
+                "INSERT INTO lsh_buckets (band, bucket, vacancy_key) VALUES (?, ?, ?)",
+                [(band, bucket, key) for band, bucket in buckets]
+            )
+
+        if duplicate_of:
+            logger.info(f"Dublikat vakansiya: {key} -> {duplicate_of} (o'xshashlik {best:.2f})")
+        return duplicate_of
+
+    def _duplicate_of(self, key: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT duplicate_of FROM signatures WHERE vacancy_key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    async def check(self, vacancy: dict) -> Optional[str]:
+        """
+        Vakansiyani avval ko'rilganlar bilan solishtirish va imzosini saqlash.
+
+        Argumentlar:
+            vacancy: Vakansiya lug'ati (id, url, title, employer, description).
+
+        Qaytaradi:
+            Asl vakansiya kaliti (ID yoki URL), agar bu dublikat bo'lsa, aks holda None.
+            Tavsifi bo'sh vakansiya (masalan, sahifani olish muvaffaqsiz bo'lgan)
+            tekshirilmaydi va saqlanmaydi: faqat sarlavha va ish beruvchidan olingan
+            imzo bir xil nomdagi boshqa vakansiyalar bilan 1.0 o'xshashlik beradi.
+        """
+        key = vacancy.get("id") or vacancy["url"]
+        if not (vacancy.get("description") or "").strip():
+            logger.debug(f"Tavsif bo'sh, dublikat tekshiruvi o'tkazib yuborildi: {key}")
+            return None
+        async with self._lock:
+            return await asyncio.to_thread(
+                self._check,
+                key,
+                vacancy["url"],
+                self._text(vacancy),
+                self._settings.dedup_threshold
+            )
+
+    async def duplicate_of(self, key: str) -> Optional[str]:
+        """Oldin saqlangan vakansiya dublikat deb belgilanganmi — asl kalitini qaytarish."""
+        async with self._lock:
+            return await asyncio.to_thread(self._duplicate_of, key)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Dublikatlar detektorining global namunasi
+duplicate_detector = DuplicateDetector()
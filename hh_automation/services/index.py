@@ -0,0 +1,240 @@
+"""Yig'ilgan vakansiyalarning mahalliy SQLite FTS5 indeksi."""
+
+import asyncio
+import logging
+import re
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    rowid INTEGER PRIMARY KEY,
+    vacancy_key TEXT NOT NULL UNIQUE,
+    vacancy_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    employer TEXT NOT NULL,
+    description TEXT NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS vacancies_scraped_at ON vacancies(scraped_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5(
+    title, employer, description,
+    content='vacancies', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+    INSERT INTO vacancies_fts(rowid, title, employer, description)
+    VALUES (new.rowid, new.title, new.employer, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+    INSERT INTO vacancies_fts(vacancies_fts, rowid, title, employer, description)
+    VALUES ('delete', old.rowid, old.title, old.employer, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_au AFTER UPDATE ON vacancies BEGIN
+    INSERT INTO vacancies_fts(vacancies_fts, rowid, title, employer, description)
+    VALUES ('delete', old.rowid, old.title, old.employer, old.description);
+    INSERT INTO vacancies_fts(rowid, title, employer, description)
+    VALUES (new.rowid, new.title, new.employer, new.description);
+END;
+"""
+
+# bm25() ustun og'irliklari: sarlavha, ish beruvchi, tavsif
+_BM25_WEIGHTS = (10.0, 3.0, 1.0)
+
+
+def _casefold(value: Optional[str]) -> Optional[str]:
+    return value.casefold() if value is not None else None
+
+
+def _match_expression(keywords: str) -> str:
+    """Foydalanuvchi matnini xavfsiz FTS5 MATCH ifodasiga aylantirish."""
+    tokens = _TOKEN_RE.findall(keywords)
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+class VacancyIndex:
+    """
+    Yig'ilgan vakansiyalarni SQLite FTS5 da saqlaydi va qidiradi.
+
+    SQLite chaqiruvlari sinxron, shuning uchun asinxron metodlar ularni
+    alohida oqimda bajaradi.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            path = self._path or get_settings().vacancy_index_file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            # SQLite LIKE/lower() faqat ASCII uchun registrni e'tiborsiz qoldiradi (kirill nomlar uchun emas)
+            conn.create_function("casefold", 1, _casefold, deterministic=True)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.info(f"Vakansiyalar indeksi ochildi: {path}")
+        return self._conn
+
+    def _add_many(self, vacancies: list[dict], scraped_at: float) -> int:
+        conn = self._connect()
+        rows = [
+            (
+                vacancy.get("id") or vacancy["url"],
+                vacancy.get("id", ""),
+                vacancy["url"],
+                vacancy.get("title", ""),
+                vacancy.get("employer", ""),
+                vacancy.get("description", ""),
+                scraped_at,
+            )
+            for vacancy in vacancies
+            if vacancy.get("url")
+        ]
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO vacancies
+                    (vacancy_key, vacancy_id, url, title, employer, description, scraped_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(vacancy_key) DO UPDATE SET
+                    url = excluded.url,
+                    title = excluded.title,
+                    employer = excluded.employer,
+                    description = CASE
+                        WHEN excluded.description != '' THEN excluded.description
+                        ELSE vacancies.description
+                    END,
+                    scraped_at = excluded.scraped_at
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def _query(
+        self,
+        keywords: Optional[str],
+        employer: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+        limit: int,
+        offset: int,
+    ) -> list[dict]:
+        conn = self._connect()
+        where: list[str] = []
+        params: list = []
+        match = _match_expression(keywords) if keywords else ""
+
+        if match:
+            select = (
+                "SELECT v.*, bm25(vacancies_fts, ?, ?, ?) AS rank "
+                "FROM vacancies_fts JOIN vacancies v ON v.rowid = vacancies_fts.rowid"
+            )
+            params.extend(_BM25_WEIGHTS)
+            where.append("vacancies_fts MATCH ?")
+            params.append(match)
+            order = "rank, v.scraped_at DESC"
+        else:
+            select = "SELECT v.*, NULL AS rank FROM vacancies v"
+            order = "v.scraped_at DESC"
+
+        if employer:
+            where.append("instr(casefold(v.employer), ?) > 0")
+            params.append(employer.casefold())
+        if since is not None:
+            where.append("v.scraped_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("v.scraped_at <= ?")
+            params.append(until)
+
+        sql = select
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        return [
+            {
+                "id": row["vacancy_id"],
+                "title": row["title"],
+                "url": row["url"],
+                "employer": row["employer"],
+                "description": row["description"],
+                "scraped_at": datetime.fromtimestamp(row["scraped_at"]).isoformat(timespec="seconds"),
+                # bm25() manfiy qiymat qaytaradi: kichikroq — mosroq
+                "rank": -row["rank"] if row["rank"] is not None else None,
+            }
+            for row in conn.execute(sql, params)
+        ]
+
+    async def add_many(self, vacancies: list[dict], scraped_at: Optional[float] = None) -> int:
+        """
+        Vakansiyalarni indeksga qo'shish yoki yangilash.
+
+        Argumentlar:
+            vacancies: Vakansiyalar lug'atlari (id, url, title, employer, description).
+            scraped_at: Yig'ilgan vaqt (Unix vaqti). Standart: hozirgi vaqt.
+
+        Qaytaradi:
+            Saqlangan yozuvlar soni.
+        """
+        async with self._lock:
+            return await asyncio.to_thread(self._add_many, vacancies, scraped_at or time.time())
+
+    async def query(
+        self,
+        keywords: Optional[str] = None,
+        employer: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[dict]:
+        """
+        Indeksdan vakansiyalarni qidirish.
+
+        Argumentlar:
+            keywords: Kalit so'zlar (barchasi mos kelishi kerak). Natijalar BM25 bo'yicha tartiblanadi.
+            employer: Ish beruvchi nomining bir qismi (registrga bog'liq emas, kirillda ham).
+            since: Shu vaqtdan keyin yig'ilganlar.
+            until: Shu vaqtgacha yig'ilganlar.
+            limit: Maksimal natijalar soni.
+            offset: O'tkazib yuboriladigan natijalar soni.
+
+        Qaytaradi:
+            Vakansiyalar lug'atlari ro'yxati (scraped_at va rank bilan).
+        """
+        async with self._lock:
+            return await asyncio.to_thread(
+                self._query,
+                keywords,
+                employer,
+                since.timestamp() if since else None,
+                until.timestamp() if until else None,
+                limit,
+                offset,
+            )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Vakansiyalar indeksining global namunasi
+vacancy_index = VacancyIndex()
@@ -0,0 +1,108 @@
+"""Vakansiya sahifasi holatini bitta page.evaluate chaqiruvida olish."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+# Javob berish elementlari selektorlari (snapshot va bosishlar uchun umumiy)
+RESPONSE_LINK_TOP = "[data-qa='vacancy-response-link-top']"
+RESPONSE_LINK_BOTTOM = "[data-qa='vacancy-response-link-bottom']"
+DROPDOWN_ARROW = f"{RESPONSE_LINK_TOP} + button, {RESPONSE_LINK_BOTTOM} + button"
+POPUP = "[data-qa='vacancy-response-popup']"
+POPUP_LETTER_INPUT = "textarea[data-qa='vacancy-response-popup-form-letter-input']"
+POPUP_SUBMIT = "button[data-qa='vacancy-response-submit-popup']"
+COVER_LETTER_LINK_TEXT = "Написать сопроводительное"
+COVER_LETTER_LINK = f"a:has-text('{COVER_LETTER_LINK_TEXT}')"
+LETTER_OPTION_TEXT = "Kuzatuv xati bilan"
+SEND_BUTTON_TEXT = "Yuborish"
+ALREADY_APPLIED_TEXT = "Siz javob berdingiz"
+RESUME_DELIVERED_TEXT = "Rezyume yetkazildi"
+SUCCESS_TEXTS = ("Javob topshirildi", ALREADY_APPLIED_TEXT, RESUME_DELIVERED_TEXT)
+
+_SNAPSHOT_JS = """
+(s) => {
+    const has = (selector) => document.querySelector(selector) !== null;
+    const html = document.documentElement ? document.documentElement.outerHTML.toLowerCase() : "";
+    const text = (document.body ? document.body.innerText : "").replace(/\\s+/g, " ").toLowerCase();
+    const hasText = (value) => text.includes(value.toLowerCase());
+    const markers = new Set();
+    for (const el of document.querySelectorAll("[data-qa^='vacancy-response']")) {
+        markers.add(el.getAttribute("data-qa"));
+    }
+    const dropdownArrow = has(s.dropdownArrow);
+    const coverLetterLink = [...document.querySelectorAll("a")]
+        .some(a => a.textContent.includes(s.coverLetterLinkText));
+    if (dropdownArrow) markers.add("dropdown-arrow");
+    if (coverLetterLink) markers.add("cover-letter-link");
+    return {
+        captcha: document.title.toLowerCase().includes("captcha") || html.includes("robot"),
+        already_applied: hasText(s.alreadyAppliedText),
+        response_link_top: has(s.responseLinkTop),
+        response_link_bottom: has(s.responseLinkBottom),
+        cover_letter_link: coverLetterLink,
+        dropdown_arrow: dropdownArrow,
+        letter_option: hasText(s.letterOptionText),
+        popup: has(s.popup),
+        popup_letter_input: has(s.popupLetterInput),
+        popup_submit: has(s.popupSubmit),
+        textarea: has("textarea"),
+        send_button: [...document.querySelectorAll("button")]
+            .some(b => b.textContent.includes(s.sendButtonText)),
+        resume_delivered: hasText(s.resumeDeliveredText),
+        success: s.successTexts.some(hasText),
+        markers: [...markers].sort(),
+    };
+}
+"""
+
+_SNAPSHOT_ARGS = {
+    "responseLinkTop": RESPONSE_LINK_TOP,
+    "responseLinkBottom": RESPONSE_LINK_BOTTOM,
+    "dropdownArrow": DROPDOWN_ARROW,
+    "popup": POPUP,
+    "popupLetterInput": POPUP_LETTER_INPUT,
+    "popupSubmit": POPUP_SUBMIT,
+    "coverLetterLinkText": COVER_LETTER_LINK_TEXT,
+    "letterOptionText": LETTER_OPTION_TEXT,
+    "sendButtonText": SEND_BUTTON_TEXT,
+    "alreadyAppliedText": ALREADY_APPLIED_TEXT,
+    "resumeDeliveredText": RESUME_DELIVERED_TEXT,
+    "successTexts": list(SUCCESS_TEXTS),
+}
+
+
+@dataclass
+class PageSnapshot:
+    """Javob berish qarorlari uchun kerakli sahifa belgilari."""
+    captcha: bool = False
+    already_applied: bool = False
+    response_link_top: bool = False
+    response_link_bottom: bool = False
+    cover_letter_link: bool = False
+    dropdown_arrow: bool = False
+    letter_option: bool = False
+    popup: bool = False
+    popup_letter_input: bool = False
+    popup_submit: bool = False
+    textarea: bool = False
+    send_button: bool = False
+    resume_delivered: bool = False
+    success: bool = False
+    markers: list[str] = field(default_factory=list)
+
+    @property
+    def has_response_link(self) -> bool:
+        return self.response_link_top or self.response_link_bottom
+
+    def fingerprint(self, message: str) -> str:
+        """Sahifa tuzilishining qisqa izi (strategiyalar statistikasi uchun)."""
+        return ",".join(self.markers) + ("|letter" if message else "|no-letter")
+
+
+async def take_snapshot(page: Page) -> PageSnapshot:
+    """Sahifa holatini bitta IPC chaqiruvida olish."""
+    return PageSnapshot(**await page.evaluate(_SNAPSHOT_JS, _SNAPSHOT_ARGS))
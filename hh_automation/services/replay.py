@@ -0,0 +1,210 @@
+"""Tarmoq trafigi va DOM ni yozib olish hamda oflayn qayta ijro etish."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from ..config import get_settings
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Page, Request, Route
+
+logger = logging.getLogger(__name__)
+
+# Rejimlar: live — oddiy ish, record — yozib olish, replay — yozuvdan ijro
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+
+# Javob tanasi allaqachon ochilgan, shuning uchun bu sarlavhalar qayta yuborilmaydi
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# Fiksturalar commitlar orasida saqlanadi, shuning uchun sessiya ma'lumotlari yozilmaydi
+_SECRET_HEADERS = {"cookie", "set-cookie", "authorization", "proxy-authorization", "x-xsrftoken"}
+
+_UNSAFE_CHARS_RE = re.compile(r"[^\w.-]+", re.UNICODE)
+
+
+def fixture_name(*parts: Any) -> str:
+    """Fikstura nomini xavfsiz katalog nomiga aylantirish."""
+    name = "-".join(str(part) for part in parts if part not in (None, ""))
+    return _UNSAFE_CHARS_RE.sub("_", name.lower()).strip("_")[:120]
+
+
+def sanitize_har(har_path: Path) -> int:
+    """
+    HAR yozuvidan cookie va avtorizatsiya sarlavhalarini olib tashlash.
+
+    Qaytaradi:
+        Olib tashlangan sarlavhalar va cookie lar soni.
+    """
+    har = json.loads(har_path.read_text(encoding="utf-8"))
+    removed = 0
+    for entry in har.get("log", {}).get("entries", []):
+        for part in (entry.get("request", {}), entry.get("response", {})):
+            headers = part.get("headers", [])
+            kept = [h for h in headers if h.get("name", "").lower() not in _SECRET_HEADERS]
+            removed += len(headers) - len(kept) + len(part.get("cookies", []))
+            part["headers"] = kept
+            part["cookies"] = []
+    har_path.write_text(json.dumps(har, ensure_ascii=False), encoding="utf-8")
+    return removed
+
+
+class FixtureStore:
+    """
+    Yozib olingan fiksturalar ombori.
+
+    Har bir fikstura alohida katalog:
+        traffic.har          — HAR formatidagi tarmoq trafigi (tanalar ichida)
+        dom/NN-<bosqich>.html — bosqichlardagi DOM nusxalari
+        meta.json            — operatsiya turi va argumentlari
+        result.json          — yozib olishdagi natija (tahlilchi to'g'riligini tekshirish uchun)
+        timings-<rejim>.json — bosqichlar vaqti
+    """
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self._root = root
+
+    @property
+    def root(self) -> Path:
+        return self._root or get_settings().fixture_store_dir
+
+    def path(self, name: str) -> Path:
+        return self.root / name
+
+    def har_path(self, name: str) -> Path:
+        return self.path(name) / "traffic.har"
+
+    def names(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "traffic.har").exists())
+
+    def read_json(self, name: str, filename: str) -> Optional[Any]:
+        path = self.path(name) / filename
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def write_json(self, name: str, filename: str, data: Any) -> None:
+        path = self.path(name) / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def remove(self, name: str, filename: str) -> None:
+        (self.path(name) / filename).unlink(missing_ok=True)
+
+
+class ReplayRouter:
+    """
+    HAR yozuvidan javoblarni Playwright routing orqali qaytaradi.
+
+    So'rovlar (metod, URL) bo'yicha moslashtiriladi; bir xil so'rov bir necha
+    marta yozilgan bo'lsa, javoblar yozilgan tartibda qaytariladi. Yozuvda
+    yo'q so'rovlar bekor qilinadi — ijro to'liq oflayn va deterministik.
+    """
+
+    def __init__(self, har_path: Path, latency_ms: int = 0) -> None:
+        self._latency = latency_ms / 1000
+        self._entries: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        self._served: dict[tuple[str, str], int] = defaultdict(int)
+        self.misses: list[str] = []
+
+        har = json.loads(har_path.read_text(encoding="utf-8"))
+        for entry in har.get("log", {}).get("entries", []):
+            request = entry.get("request", {})
+            key = (request.get("method", "GET"), request.get("url", "").split("#")[0])
+            self._entries[key].append(entry.get("response", {}))
+
+    def _next_response(self, method: str, url: str) -> Optional[dict]:
+        key = (method, url.split("#")[0])
+        responses = self._entries.get(key)
+        if not responses:
+            return None
+        index = min(self._served[key], len(responses) - 1)
+        self._served[key] += 1
+        return responses[index]
+
+    async def _handle(self, route: Route, request: Request) -> None:
+        response = self._next_response(request.method, request.url)
+        if response is None:
+            self.misses.append(f"{request.method} {request.url}")
+            await route.abort()
+            return
+
+        if self._latency:
+            await asyncio.sleep(self._latency)
+
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = {
+            header["name"]: header["value"]
+            for header in response.get("headers", [])
+            if header["name"].lower() not in _SKIPPED_HEADERS
+        }
+        await route.fulfill(status=response.get("status", 200), headers=headers, body=body)
+
+    async def install(self, context: BrowserContext) -> None:
+        await context.route("**/*", self._handle)
+
+
+class StageRecorder:
+    """
+    Operatsiya bosqichlari vaqtini o'lchaydi.
+
+    record rejimida har bir bosqichda DOM nusxasi saqlanadi; record va replay
+    rejimlarida bosqichlar vaqti fikstura katalogiga yoziladi.
+    """
+
+    def __init__(self, page: Page, name: str, mode: str, store: Optional[FixtureStore] = None) -> None:
+        self._page = page
+        self._name = name
+        self._mode = mode
+        self._store = store or fixture_store
+        self._started = time.perf_counter()
+        self._last = self._started
+        self.timings: list[dict] = []
+
+    async def mark(self, stage: str) -> None:
+        """Oldingi bosqichdan beri o'tgan vaqtni qayd etish."""
+        now = time.perf_counter()
+        self.timings.append({"stage": stage, "ms": round((now - self._last) * 1000, 2)})
+        self._last = now
+
+        if self._mode == RECORD:
+            try:
+                path = self._store.path(self._name) / "dom" / f"{len(self.timings):02d}-{stage}.html"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(await self._page.content(), encoding="utf-8")
+            except Exception as e:
+                logger.warning(f"DOM nusxasini saqlash muvaffaqsiz bo'ldi ({stage}): {e}")
+            # Snapshot vaqti bosqichlarga qo'shilmasin
+            self._last = time.perf_counter()
+
+    def finish(self, result: Any = None) -> None:
+        """Bosqichlar vaqtini (va record rejimida natijani) saqlash."""
+        total = round((time.perf_counter() - self._started) * 1000, 2)
+        logger.debug(f"Bosqichlar vaqti [{self._name}]: {self.timings} (jami {total} ms)")
+        if self._mode == LIVE:
+            return
+        self._store.write_json(
+            self._name,
+            f"timings-{self._mode}.json",
+            {"stages": self.timings, "total_ms": total}
+        )
+        if self._mode == RECORD and result is not None:
+            self._store.write_json(self._name, "result.json", result)
+
+
+# Fiksturalar omborining global namunasi
+fixture_store = FixtureStore()
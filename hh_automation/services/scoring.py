@@ -0,0 +1,133 @@
+"""Vakansiyalarni rezyume profiliga moslik bo'yicha baholash (BM25 + kosinus)."""
+
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    """Matnni kichik harfli so'zlarga ajratish (bitta harfli va faqat raqamli so'zlarsiz)."""
+    return [
+        token for token in _TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and not token.isdigit()
+    ]
+
+
+class RelevanceScorer:
+    """
+    Vakansiyalar partiyasini rezyume profiliga nisbatan baholaydi.
+
+    Har bir vakansiya BM25 og'irlikli so'z vektoriga aylantiriladi (IDF
+    shu partiya bo'yicha hisoblanadi), profil esa log(1+tf)*IDF vektoriga.
+    Ball — ular orasidagi kosinus o'xshashlik, 0 dan 1 gacha. Butun partiya
+    bitta NumPy matritsasi sifatida hisoblanadi.
+    """
+
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        title_weight: int = 2
+    ) -> None:
+        self._profile = profile
+        self._k1 = k1
+        self._b = b
+        self._title_weight = title_weight
+        self._settings = get_settings()
+        self._profile_cache: tuple[Optional[float], str] = (None, "")
+
+    def _load_profile(self) -> str:
+        """Profil matnini sozlamalardan yoki fayldan olish (fayl mtime bo'yicha keshlanadi)."""
+        if self._profile is not None:
+            return self._profile
+
+        path: Optional[Path] = self._settings.resume_profile_file
+        if path is not None:
+            try:
+                mtime = path.stat().st_mtime
+            except OSError as e:
+                logger.warning(f"Rezyume profili faylini o'qib bo'lmadi {path}: {e}")
+            else:
+                if self._profile_cache[0] != mtime:
+                    self._profile_cache = (mtime, path.read_text(encoding="utf-8"))
+                return self._profile_cache[1]
+
+        return self._settings.resume_profile
+
+    @property
+    def enabled(self) -> bool:
+        """Profil sozlanganligini tekshirish."""
+        return bool(tokenize(self._load_profile()))
+
+    def _document_text(self, vacancy: dict) -> str:
+        title = vacancy.get("title", "")
+        return " ".join([title] * self._title_weight + [vacancy.get("description", "")])
+
+    def score(self, vacancies: list[dict]) -> Optional[list[float]]:
+        """
+        Har bir vakansiya uchun moslik ballini hisoblash.
+
+        Argumentlar:
+            vacancies: Vakansiyalar lug'atlari (title, description).
+
+        Qaytaradi:
+            Vakansiyalar tartibida 0..1 oralig'idagi ballar yoki profil
+            sozlanmagan bo'lsa None.
+        """
+        profile_tokens = tokenize(self._load_profile())
+        if not profile_tokens:
+            return None
+        if not vacancies:
+            return []
+
+        import numpy as np
+
+        documents = [tokenize(self._document_text(vacancy)) for vacancy in vacancies]
+
+        vocabulary: dict[str, int] = {}
+        rows: list[int] = []
+        cols: list[int] = []
+        for row, tokens in enumerate(documents + [profile_tokens]):
+            for token in tokens:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(token, len(vocabulary)))
+
+        counts = np.zeros((len(documents) + 1, len(vocabulary)), dtype=np.float64)
+        np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+        tf, query_tf = counts[:-1], counts[-1]
+
+        # IDF faqat vakansiyalar partiyasi bo'yicha
+        n_docs = tf.shape[0]
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+        # BM25 tf to'yinishi va hujjat uzunligi bo'yicha normallashtirish
+        lengths = tf.sum(axis=1, keepdims=True)
+        avg_length = max(float(lengths.mean()), 1.0)
+        norm = self._k1 * (1.0 - self._b + self._b * lengths / avg_length)
+        doc_weights = tf * (self._k1 + 1.0) / (tf + norm) * idf
+
+        query_weights = np.log1p(query_tf) * idf
+
+        doc_norms = np.linalg.norm(doc_weights, axis=1)
+        query_norm = np.linalg.norm(query_weights)
+        denominator = doc_norms * query_norm
+        similarity = np.divide(
+            doc_weights @ query_weights,
+            denominator,
+            out=np.zeros(n_docs),
+            where=denominator > 0
+        )
+        return np.clip(similarity, 0.0, 1.0).tolist()
+
+
+# Moslik baholovchisining global namunasi
+relevance_scorer = RelevanceScorer()
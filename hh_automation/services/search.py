@@ -1,16 +1,64 @@
 """Vakansiyalarni qidirish asinxron xizmati."""
 
+from __future__ import annotations
+
 import logging
+import re
 from dataclasses import dataclass
-from typing import Optional
-
-from playwright.async_api import Page
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from ..config import get_settings
 from .browser import browser_manager
+from .dedup import duplicate_detector
+from .index import vacancy_index
+from .replay import StageRecorder, fixture_name
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 logger = logging.getLogger(__name__)
 
+_VACANCY_ID_RE = re.compile(r"/vacancy/(\d+)")
+
+# /search javobida so'rash mumkin bo'lgan maydonlar
+VACANCY_FIELDS = ("id", "title", "url", "employer", "description", "duplicate_of")
+
+
+def extract_vacancy_id(url: str) -> str:
+    """Vakansiya URL manzilidan raqamli ID ni ajratib olish."""
+    match = _VACANCY_ID_RE.search(url or "")
+    return match.group(1) if match else ""
+
+
+def project_vacancies(
+    vacancies: Iterable[dict],
+    fields: Optional[Iterable[str]] = None,
+    description_limit: Optional[int] = None
+) -> list[dict]:
+    """
+    Vakansiyalardan faqat kerakli maydonlarni qoldirish.
+
+    Argumentlar:
+        vacancies: Vakansiyalar lug'atlari.
+        fields: Qoldiriladigan maydonlar. None bo'lsa, barcha maydonlar qoladi.
+        description_limit: Tavsif matnining maksimal uzunligi (harflarda, "…" bilan birga).
+
+    Qaytaradi:
+        Qisqartirilgan vakansiyalar ro'yxati.
+    """
+    keep = tuple(fields) if fields is not None else None
+    projected: list[dict] = []
+    for vacancy in vacancies:
+        item = vacancy if keep is None else {k: vacancy[k] for k in keep if k in vacancy}
+        if description_limit is not None and "description" in item:
+            description = item["description"]
+            if len(description) > description_limit:
+                # "…" ham chegaraga kiradi: natija description_limit harfdan oshmaydi
+                truncated = description[:description_limit - 1].rstrip() + "…" if description_limit else ""
+                item = {**item, "description": truncated}
+        projected.append(item)
+    return projected
+
 
 @dataclass
 class Vacancy:
@@ -19,13 +67,20 @@ class Vacancy:
     url: str
     employer: str
     description: str = ""
+    duplicate_of: Optional[str] = None
+
+    @property
+    def id(self) -> str:
+        return extract_vacancy_id(self.url)
 
     def to_dict(self) -> dict:
         return {
+            "id": self.id,
             "title": self.title,
             "url": self.url,
             "employer": self.employer,
-            "description": self.description
+            "description": self.description,
+            "duplicate_of": self.duplicate_of
         }
 
 
@@ -59,6 +114,15 @@ class VacancySearchService:
             logger.warning(f"Vakansiya tavsifini olish muvaffaqsiz bo'ldi {url}: {e}")
             return ""
 
+    async def _mark_duplicate(self, vacancy: Vacancy) -> None:
+        """Vakansiyani avval ko'rilganlar bilan solishtirib, dublikat bo'lsa belgilash."""
+        if not self._settings.dedup_enabled:
+            return
+        try:
+            vacancy.duplicate_of = await duplicate_detector.check(vacancy.to_dict())
+        except Exception as e:
+            logger.warning(f"Dublikatni tekshirish muvaffaqsiz bo'ldi {vacancy.url}: {e}")
+
     async def _check_bot_protection(self, page: Page) -> bool:
         """Bot himoyasi ishga tushishi (kapcha) tekshirish."""
         title = await page.title()
@@ -79,16 +143,25 @@ class VacancySearchService:
             
         Qaytaradi:
             Sarlavha, URL, ish beruvchi va tavsif bilan vakansiyalar lug'atlari ro'yxati.
+            Dublikatlarda `duplicate_of` asl vakansiya ID siga teng.
             
         Istisno:
             RuntimeError: Agar bot himoyasi ishga tushsa.
             FileNotFoundError: Agar sessiya fayli topilmasa.
+            SessionExpiredError: Agar sessiya muddati tugagan bo'lsa.
         """
         query = query or self._settings.default_search_text
         
         logger.info(f"Vakansiyalarni qidirish: so'rov='{query}', sahifa={page_num}")
 
-        async with browser_manager.get_page(use_session=True) as page:
+        fixture = fixture_name("search", query, self._settings.area_code, f"p{page_num}")
+        fixture_meta = {"kind": "search", "query": query, "page": page_num}
+
+        async with browser_manager.get_page(
+            use_session=True, fixture=fixture, fixture_meta=fixture_meta
+        ) as page:
+            stages = StageRecorder(page, fixture, browser_manager.mode)
+
             # Qidiruv uchun URL tuzish
             url = (
                 f"https://hh.ru/search/vacancy?"
@@ -103,6 +176,7 @@ class VacancySearchService:
 
             # Natijalaring kutilishi
             await page.wait_for_selector("[data-qa='vacancy-serp__vacancy']", timeout=10000)
+            await stages.mark("serp")
             
             # Qidiruv natijalari bo'yicha vakansiyalar asosiy ma'lumotlarini to'plash
             vacancy_data: list[dict] = []
@@ -133,17 +207,29 @@ class VacancySearchService:
                     logger.warning(f"Vakansiya kartochkasini tahlil qilish muvaffaqsiz bo'ldi {i}: {e}")
                     continue
 
+            await stages.mark("serp_parse")
+
             # Har bir vakansiya uchun to'liq tavsifni olish
             vacancies: list[dict] = []
-            for data in vacancy_data:
+            for i, data in enumerate(vacancy_data):
                 description = await self._get_vacancy_description(page, data["url"])
+                await stages.mark(f"description_{i}")
                 vacancy = Vacancy(
                     title=data["title"],
                     url=data["url"],
                     employer=data["employer"],
                     description=description
                 )
+                await self._mark_duplicate(vacancy)
                 vacancies.append(vacancy.to_dict())
 
             logger.info(f"{len(vacancies)} ta vakansiya topildi")
-            return vacancies
+            stages.finish(vacancies)
+
+        if self._settings.vacancy_index_enabled and vacancies:
+            try:
+                await vacancy_index.add_many(vacancies)
+            except Exception as e:
+                logger.warning(f"Vakansiyalarni indeksga saqlash muvaffaqsiz bo'ldi: {e}")
+
+        return vacancies
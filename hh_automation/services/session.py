@@ -0,0 +1,161 @@
+"""Saqlangan hh.uz sessiyasining amal qilishini navigatsiyasiz tekshirish."""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# hh.uz avtorizatsiya cookie si
+AUTH_COOKIE = "hhtoken"
+
+
+class SessionExpiredError(Exception):
+    """Sessiya muddati tugagan yoki server uni rad etgan."""
+
+
+@dataclass
+class SessionInfo:
+    """Sessiya faylidan o'qilgan ma'lumot."""
+    mtime: float
+    has_auth_cookie: bool
+    expires_at: Optional[float]
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+
+@dataclass
+class ProbeResult:
+    """Avtorizatsiyalangan tekshiruv so'rovi natijasi."""
+    valid: Optional[bool]
+    checked_at: float
+    session_mtime: float
+    detail: str = ""
+
+
+class SessionChecker:
+    """
+    Sessiya faylining cookie larini o'qib keshlaydi (fayl mtime o'zgarganda
+    qayta o'qiladi) va oxirgi tekshiruv so'rovi natijasini saqlaydi.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self._path = path
+        self._info: Optional[SessionInfo] = None
+        self._probe: Optional[ProbeResult] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path or get_settings().session_file
+
+    def load(self) -> Optional[SessionInfo]:
+        """Sessiya faylini o'qish. Fayl yo'q bo'lsa None."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            self._info = None
+            return None
+
+        if self._info is not None and self._info.mtime == mtime:
+            return self._info
+
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+            cookies = state.get("cookies", [])
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Sessiya faylini o'qib bo'lmadi {self.path}: {e}")
+            cookies = []
+
+        auth_cookies = [c for c in cookies if c.get("name") == AUTH_COOKIE]
+        expires = [c.get("expires", -1) for c in auth_cookies]
+        # expires == -1 — brauzer sessiyasi cookie si, muddati noma'lum
+        expires_at = min((e for e in expires if e and e > 0), default=None)
+
+        self._info = SessionInfo(
+            mtime=mtime,
+            has_auth_cookie=bool(auth_cookies),
+            expires_at=expires_at,
+        )
+        logger.debug(f"Sessiya fayli qayta o'qildi: {self._info}")
+        return self._info
+
+    def record_probe(self, valid: Optional[bool], detail: str = "") -> None:
+        """Tekshiruv so'rovi natijasini saqlash (valid=None — aniqlab bo'lmadi)."""
+        info = self.load()
+        self._probe = ProbeResult(
+            valid=valid,
+            checked_at=time.time(),
+            session_mtime=info.mtime if info else 0.0,
+            detail=detail,
+        )
+
+    def _current_probe(self, info: SessionInfo) -> Optional[ProbeResult]:
+        # Fayl yangilangan bo'lsa (qayta kirish), eski tekshiruv natijasi hisobga olinmaydi
+        if self._probe is not None and self._probe.session_mtime == info.mtime:
+            return self._probe
+        return None
+
+    def validate(self) -> None:
+        """
+        Sessiyani brauzersiz tekshirish.
+
+        Istisno:
+            FileNotFoundError: Agar sessiya fayli topilmasa.
+            SessionExpiredError: Agar cookie muddati tugagan yoki tekshiruv so'rovi rad etilgan bo'lsa.
+        """
+        info = self.load()
+        if info is None:
+            raise FileNotFoundError(
+                f"Session file not found: {self.path}. "
+                "Run 'python -m hh_automation.cli.login' first."
+            )
+        if not info.has_auth_cookie:
+            raise SessionExpiredError(
+                f"Session has no '{AUTH_COOKIE}' cookie. "
+                "Run 'python -m hh_automation.cli.login' again."
+            )
+        if info.expired:
+            raise SessionExpiredError(
+                "Session expired. Run 'python -m hh_automation.cli.login' again."
+            )
+        probe = self._current_probe(info)
+        if probe is not None and probe.valid is False:
+            raise SessionExpiredError(
+                f"Session rejected by hh.uz ({probe.detail}). "
+                "Run 'python -m hh_automation.cli.login' again."
+            )
+
+    def status(self) -> dict:
+        """Sessiya holati /health uchun."""
+        info = self.load()
+        if info is None:
+            return {"exists": False, "valid": False}
+
+        probe = self._current_probe(info)
+        try:
+            self.validate()
+            valid = True
+        except (FileNotFoundError, SessionExpiredError):
+            valid = False
+
+        return {
+            "exists": True,
+            "valid": valid,
+            "expires_at": info.expires_at,
+            "probe": {
+                "valid": probe.valid,
+                "checked_at": probe.checked_at,
+                "detail": probe.detail,
+            } if probe else None,
+        }
+
+
+# Sessiya tekshiruvchisining global namunasi
+session_checker = SessionChecker()
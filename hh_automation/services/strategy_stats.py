@@ -0,0 +1,96 @@
+"""Sahifa tuzilishi bo'yicha javob berish strategiyalari statistikasi."""
+
+import json
+import logging
+import os
+import random
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class StrategyStats:
+    """
+    Har bir sahifa tuzilishi (fingerprint) uchun strategiyalarning urinish va
+    muvaffaqiyatlar sonini JSON faylda saqlaydi va ular bo'yicha tartib beradi.
+
+    Tartib Laplas bo'yicha silliqlangan muvaffaqiyat ulushi bilan aniqlanadi:
+    (muvaffaqiyat + 1) / (urinish + 2). Teng bo'lsa, standart tartib saqlanadi.
+
+    Har bir yangi natijada shu tuzilishdagi eski hisoblar `decay` ga
+    ko'paytiriladi, shuning uchun bitta tasodifiy muvaffaqiyatsizlik tartibni
+    abadiy o'zgartirib qo'ymaydi. `order(explore=...)` ehtimoli bilan standart
+    tartib qaytariladi — orqada qolgan strategiyalar ham vaqti-vaqti bilan sinaladi.
+    """
+
+    def __init__(self, path: Optional[Path] = None, decay: float = 0.9) -> None:
+        self._path = path
+        self._decay = decay
+        self._data: Optional[dict[str, dict[str, dict[str, float]]]] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path or get_settings().strategy_stats_file
+
+    def _load(self) -> dict[str, dict[str, dict[str, float]]]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._data = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Strategiyalar statistikasini o'qib bo'lmadi {self.path}: {e}")
+                self._data = {}
+        return self._data
+
+    def _save(self) -> None:
+        path = self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _rate(counts: Optional[dict[str, float]]) -> float:
+        if not counts:
+            return 0.5
+        return (counts["successes"] + 1) / (counts["attempts"] + 2)
+
+    def order(self, fingerprint: str, strategies: Sequence[str], explore: float = 0.0) -> list[str]:
+        """
+        Strategiyalarni shu tuzilishdagi tarixiy muvaffaqiyat bo'yicha tartiblash.
+
+        Argumentlar:
+            fingerprint: Sahifa tuzilishi izi.
+            strategies: Strategiyalar standart tartibda.
+            explore: Statistikaga qaramay standart tartibni qaytarish ehtimoli.
+        """
+        if explore and random.random() < explore:
+            return list(strategies)
+        layout = self._load().get(fingerprint, {})
+        return sorted(strategies, key=lambda name: -self._rate(layout.get(name)))
+
+    def record(self, fingerprint: str, strategy: str, success: bool) -> None:
+        """Strategiya urinishi natijasini qayd etish (eski hisoblar so'ndiriladi)."""
+        layout = self._load().setdefault(fingerprint, {})
+        for other in layout.values():
+            other["attempts"] = round(other["attempts"] * self._decay, 4)
+            other["successes"] = round(other["successes"] * self._decay, 4)
+        counts = layout.setdefault(strategy, {"attempts": 0, "successes": 0})
+        counts["attempts"] += 1
+        counts["successes"] += int(success)
+        try:
+            self._save()
+        except OSError as e:
+            logger.warning(f"Strategiyalar statistikasini saqlab bo'lmadi: {e}")
+
+    def snapshot(self) -> dict:
+        """Statistikaning nusxasi."""
+        return json.loads(json.dumps(self._load()))
+
+
+# Strategiyalar statistikasining global namunasi
+strategy_stats = StrategyStats()
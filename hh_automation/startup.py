@@ -0,0 +1,29 @@
+"""Server ishga tushish vaqtlarini o'lchash."""
+
+import time
+from typing import Optional
+
+# Modul importi server jarayonidagi eng birinchi importlardan biri bo'lishi kerak
+_STARTED = time.perf_counter()
+
+
+class StartupMetrics:
+    """Jarayon boshlanishidan asosiy bosqichlargacha o'tgan vaqtni saqlaydi."""
+
+    def __init__(self, started: float) -> None:
+        self._started = started
+        self._marks: dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """Bosqichni birinchi marta yuz berganida qayd etish."""
+        self._marks.setdefault(name, time.perf_counter() - self._started)
+
+    def get(self, name: str) -> Optional[float]:
+        return self._marks.get(name)
+
+    def as_dict(self) -> dict:
+        """Bosqichlar vaqtlari soniyalarda (imports, lifespan_ready, time_to_first_search)."""
+        return {name: round(seconds, 3) for name, seconds in self._marks.items()}
+
+
+startup_metrics = StartupMetrics(_STARTED)